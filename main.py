@@ -1,13 +1,15 @@
 import streamlit as st
 from streamlit_option_menu import option_menu
-import os
-import sys
-
-# Add src directory to Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
+import functools
+import importlib
+import json
+import re
+from pathlib import Path
+from typing import Callable, Literal, Optional
 
 from src.utils.config import config
 from src.utils.logger import setup_logging
+from src.utils.samples import list_sample_files
 
 # Page config
 st.set_page_config(
@@ -15,400 +17,96 @@ st.set_page_config(
 )
 
 # Custom CSS for responsive dark/light theme
-st.markdown(
-    """
-<style>
-    /* Main header with gradient text */
-    .main-header {
-        font-size: 3rem;
-        font-weight: bold;
-        text-align: center;
-        margin-bottom: 2rem;
-        background: linear-gradient(90deg, #1f4e79, #2e86ab);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-    
-    /* Responsive feature cards that adapt to theme */
-    .feature-card {
-        background: var(--background-color);
-        padding: 1.5rem;
-        border-radius: 12px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-        margin: 1rem 0;
-        border-left: 4px solid #2e86ab;
-        border: 1px solid var(--border-color);
-        color: var(--text-color);
-        transition: all 0.3s ease;
-    }
-    
-    .feature-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 12px rgba(0, 0, 0, 0.15);
-    }
-    
-    /* Risk color indicators */
-    .risk-critical { color: #ff4444; font-weight: bold; }
-    .risk-high { color: #ff6666; font-weight: bold; }
-    .risk-medium { color: #ffaa00; font-weight: bold; }
-    .risk-low { color: #ffcc00; font-weight: bold; }
-    .risk-safe { color: #44aa44; font-weight: bold; }
-    
-    /* Responsive metric cards */
-    .metric-card {
-        background: var(--secondary-background-color);
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        margin: 0.5rem 0;
-        border: 1px solid var(--border-color);
-        color: var(--text-color);
-        transition: all 0.3s ease;
-    }
-    
-    .metric-card:hover {
-        background: var(--hover-background-color);
-    }
-    
-    /* Enhanced button styling */
-    .stButton > button {
-        width: 100%;
-        background: linear-gradient(135deg, #2e86ab, #1f4e79);
-        color: white !important;
-        border: none;
-        border-radius: 10px;
-        padding: 0.75rem 1rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.2);
-    }
-    
-    .stButton > button:hover {
-        background: linear-gradient(135deg, #1f4e79, #2e86ab);
-        transform: translateY(-1px);
-        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.3);
-    }
-    
-    /* Enhanced sidebar styling for dark/light theme */
-    .css-1d391kg {
-        background: var(--background-color) !important;
-    }
-    
-    /* Streamlit sidebar container */
-    section[data-testid="stSidebar"] {
-        background: var(--background-color) !important;
-        border-right: 1px solid var(--border-color) !important;
-    }
-    
-    /* Sidebar content */
-    section[data-testid="stSidebar"] > div {
-        background: var(--background-color) !important;
-        color: var(--text-color) !important;
-    }
-    
-    /* Sidebar header */
-    section[data-testid="stSidebar"] .block-container {
-        background: var(--background-color) !important;
-        color: var(--text-color) !important;
-    }
-    
-    /* Option menu in sidebar */
-    section[data-testid="stSidebar"] .nav-link {
-        background: var(--secondary-background-color) !important;
-        color: var(--text-color) !important;
-        border: 1px solid var(--border-color) !important;
-    }
-    
-    /* Active option in sidebar */
-    section[data-testid="stSidebar"] .nav-link.active {
-        background: linear-gradient(135deg, #2e86ab, #1f4e79) !important;
-        color: white !important;
-    }
-    
-    /* Streamlit Option Menu specific styling - Force override */
-    .nav-link {
-        background: var(--secondary-background-color) !important;
-        color: var(--text-color) !important;
-        border: 1px solid var(--border-color) !important;
-        border-radius: 8px !important;
-        margin: 2px 0 !important;
-    }
-    
-    .nav-link:hover {
-        background: var(--hover-background-color) !important;
-        color: var(--text-color) !important;
-    }
-    
-    .nav-link.active {
-        background: linear-gradient(135deg, #2e86ab, #1f4e79) !important;
-        color: white !important;
-        border: 1px solid #2e86ab !important;
-    }
-    
-    /* Option menu container */
-    .nav {
-        background: transparent !important;
-    }
-    
-    /* Fix option menu wrapper */
-    div[data-testid="stVerticalBlock"] > div > div {
-        background: transparent !important;
-    }
-    
-    /* More specific selectors for option menu */
-    section[data-testid="stSidebar"] .nav-link {
-        background-color: var(--secondary-background-color) !important;
-        color: var(--text-color) !important;
-        border: 1px solid var(--border-color) !important;
-    }
-    
-    section[data-testid="stSidebar"] .nav-link:hover {
-        background-color: var(--hover-background-color) !important;
-    }
-    
-    section[data-testid="stSidebar"] .nav-link.active {
-        background-color: #2e86ab !important;
-        color: white !important;
-    }
-    
-    /* Force override any white backgrounds in sidebar */
-    section[data-testid="stSidebar"] * {
-        background-color: inherit !important;
-    }
-    
-    section[data-testid="stSidebar"] .nav-link {
-        background-color: var(--secondary-background-color) !important;
-    }
-    
-    /* File uploader styling */
-    .uploadedFile {
-        background: var(--secondary-background-color) !important;
-        border: 2px dashed var(--border-color) !important;
-        border-radius: 10px !important;
-        color: var(--text-color) !important;
-    }
-    
-    /* Tab styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 8px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        background: var(--secondary-background-color);
-        border-radius: 8px;
-        color: var(--text-color);
-        border: 1px solid var(--border-color);
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(135deg, #2e86ab, #1f4e79) !important;
-        color: white !important;
-    }
-    
-    /* Tooltip styling for risk factors */
-    .tooltip {
-        position: relative;
-        display: inline;
-        cursor: help;
-        border-radius: 4px;
-        padding: 2px 4px;
-        margin: 0 1px;
-    }
-    
-    .tooltip .tooltiptext {
-        visibility: hidden;
-        width: 300px;
-        background-color: var(--tooltip-background);
-        color: var(--tooltip-text);
-        text-align: left;
-        border-radius: 8px;
-        padding: 12px;
-        position: absolute;
-        z-index: 1000;
-        bottom: 125%;
-        left: 50%;
-        margin-left: -150px;
-        opacity: 0;
-        transition: opacity 0.3s, visibility 0.3s;
-        font-size: 13px;
-        line-height: 1.4;
-        box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3);
-        border: 1px solid var(--border-color);
-    }
-    
-    .tooltip:hover .tooltiptext {
-        visibility: visible;
-        opacity: 1;
-    }
-    
-    /* Risk highlighting */
-    .risk-critical { 
-        background-color: rgba(255, 68, 68, 0.2); 
-        border-left: 4px solid #ff4444; 
-        padding: 4px 8px;
-        border-radius: 4px;
-    }
-    .risk-high { 
-        background-color: rgba(255, 136, 0, 0.2); 
-        border-left: 4px solid #ff8800; 
-        padding: 4px 8px;
-        border-radius: 4px;
-    }
-    .risk-medium { 
-        background-color: rgba(255, 204, 0, 0.2); 
-        border-left: 4px solid #ffcc00; 
-        padding: 4px 8px;
-        border-radius: 4px;
-    }
-    .risk-low { 
-        background-color: rgba(68, 170, 68, 0.2); 
-        border-left: 4px solid #44aa44; 
-        padding: 4px 8px;
-        border-radius: 4px;
-    }
-    
-    /* Jargon term highlighting */
-    .jargon-term { 
-        background-color: rgba(46, 134, 171, 0.2); 
-        text-decoration: underline dotted #2e86ab;
-        padding: 2px 4px;
-        border-radius: 3px;
-    }
-    
-    /* Dark theme variables */
-    [data-theme="dark"] {
-        --background-color: #0e1117;
-        --secondary-background-color: #262730;
-        --text-color: #fafafa;
-        --border-color: #464a5a;
-        --hover-background-color: #3d4354;
-        --tooltip-background: #262730;
-        --tooltip-text: #fafafa;
-    }
-    
-    /* Light theme variables */
-    [data-theme="light"], :root {
-        --background-color: #ffffff;
-        --secondary-background-color: #f8f9fa;
-        --text-color: #262626;
-        --border-color: #e0e0e0;
-        --hover-background-color: #f0f0f0;
-        --tooltip-background: #333333;
-        --tooltip-text: #ffffff;
-    }
-    
-    /* Auto-detect system theme */
-    @media (prefers-color-scheme: dark) {
-        :root {
-            --background-color: #0e1117;
-            --secondary-background-color: #262730;
-            --text-color: #fafafa;
-            --border-color: #464a5a;
-            --hover-background-color: #3d4354;
-            --tooltip-background: #262730;
-            --tooltip-text: #fafafa;
-        }
-    }
-    
-    /* Hide Streamlit default elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    .stDeployButton {visibility: hidden;}
-    
-    /* Fix all Streamlit components for dark theme */
-    .stApp {
-        background: var(--background-color) !important;
-        color: var(--text-color) !important;
-    }
-    
-    /* Main content area */
-    .main .block-container {
-        background: var(--background-color) !important;
-        color: var(--text-color) !important;
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-    }
-    
-    /* Text input fields */
-    .stTextInput > div > div > input {
-        background: var(--secondary-background-color) !important;
-        color: var(--text-color) !important;
-        border: 1px solid var(--border-color) !important;
-    }
-    
-    /* Text areas */
-    .stTextArea > div > div > textarea {
-        background: var(--secondary-background-color) !important;
-        color: var(--text-color) !important;
-        border: 1px solid var(--border-color) !important;
-    }
-    
-    /* Select boxes */
-    .stSelectbox > div > div > select {
-        background: var(--secondary-background-color) !important;
-        color: var(--text-color) !important;
-        border: 1px solid var(--border-color) !important;
-    }
-    
-    /* Info, warning, error boxes */
-    .stAlert {
-        background: var(--secondary-background-color) !important;
-        color: var(--text-color) !important;
-        border: 1px solid var(--border-color) !important;
-    }
-    
-    /* Expander */
-    .streamlit-expanderHeader {
-        background: var(--secondary-background-color) !important;
-        color: var(--text-color) !important;
-        border: 1px solid var(--border-color) !important;
-    }
-    
-    /* Columns */
-    .element-container {
-        background: transparent !important;
-    }
-    
-    /* Status indicators */
-    .status-success {
-        background: rgba(68, 170, 68, 0.1);
-        border: 1px solid #44aa44;
-        border-radius: 6px;
-        padding: 8px 12px;
-        color: #44aa44;
-    }
-    
-    .status-warning {
-        background: rgba(255, 136, 0, 0.1);
-        border: 1px solid #ff8800;
-        border-radius: 6px;
-        padding: 8px 12px;
-        color: #ff8800;
-    }
-    
-    .status-error {
-        background: rgba(255, 68, 68, 0.1);
-        border: 1px solid #ff4444;
-        border-radius: 6px;
-        padding: 8px 12px;
-        color: #ff4444;
-    }
-</style>
-""",
-    unsafe_allow_html=True,
-)
+CSS_PATH = Path(__file__).parent / "static" / "lega.css"
+
+THEME_COLORS = {
+    "light": {
+        "background-color": "#ffffff",
+        "secondary-background-color": "#f8f9fa",
+        "text-color": "#262626",
+        "border-color": "#e0e0e0",
+        "hover-background-color": "#f0f0f0",
+        "tooltip-background": "#333333",
+        "tooltip-text": "#ffffff",
+    },
+    "dark": {
+        "background-color": "#0e1117",
+        "secondary-background-color": "#262730",
+        "text-color": "#fafafa",
+        "border-color": "#464a5a",
+        "hover-background-color": "#3d4354",
+        "tooltip-background": "#262730",
+        "tooltip-text": "#fafafa",
+    },
+}
+
+
+@st.cache_data(show_spinner=False)
+def render_theme_css(theme: Literal["light", "dark"]) -> str:
+    """Render the global stylesheet with literal colors for one theme."""
+    colors = THEME_COLORS[theme]
+    css = CSS_PATH.read_text(encoding="utf-8")
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"var\(--([\w-]+)\)", lambda m: colors[m.group(1)], css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return f"<style>{css.strip()}</style>"
+
+
+def get_active_theme() -> Literal["light", "dark"]:
+    """Return the theme Streamlit is currently rendering with."""
+    theme = getattr(st.context, "theme", None)
+    return "dark" if getattr(theme, "type", None) == "dark" else "light"
+
+
+# Sidebar option_menu props, kept at module scope so every rerun passes the
+# same objects to the component
+_OPTION_MENU_OPTIONS = [
+    "🏠 Home",
+    "📄 Upload",
+    "📊 Analysis",
+    "💬 Q&A",
+    "📚 Library",
+    "⚙️ Settings",
+]
+_OPTION_MENU_ICONS = ["house", "upload", "graph-up", "chat-dots", "folder", "gear"]
+_OPTION_MENU_STYLES = {
+    "container": {
+        "padding": "0!important",
+        "background-color": "transparent",
+    },
+    "icon": {"color": "#2e86ab", "font-size": "18px"},
+    "nav-link": {
+        "font-size": "16px",
+        "text-align": "left",
+        "margin": "2px 0px",
+        "padding": "8px 12px",
+        "border-radius": "8px",
+        "background-color": "transparent",
+        "color": "inherit",
+        "border": "1px solid transparent",
+        "--hover-color": "transparent",
+    },
+    "nav-link-selected": {
+        "background-color": "#2e86ab",
+        "color": "white",
+        "border": "1px solid #2e86ab",
+    },
+}
 
 
 def main():
     # Initialize logging
     setup_logging()
 
+    # Streamlit clears elements that are not re-emitted, so the stylesheet has
+    # to be sent on every rerun; caching only avoids rebuilding the string.
+    st.markdown(render_theme_css(get_active_theme()), unsafe_allow_html=True)
+
     # Initialize session state
-    if "current_document" not in st.session_state:
-        st.session_state.current_document = None
-    if "documents_library" not in st.session_state:
-        st.session_state.documents_library = []
+    st.session_state.setdefault("current_document", None)
+    st.session_state.setdefault("documents_library", [])
+    st.session_state.setdefault("documents_by_id", {})
 
     # Sidebar navigation
     with st.sidebar:
@@ -417,71 +115,44 @@ def main():
 
         selected = option_menu(
             menu_title=None,
-            options=[
-                "🏠 Home",
-                "📄 Upload",
-                "📊 Analysis",
-                "💬 Q&A",
-                "📚 Library",
-                "⚙️ Settings",
-            ],
-            icons=["house", "upload", "graph-up", "chat-dots", "folder", "gear"],
+            options=_OPTION_MENU_OPTIONS,
+            icons=_OPTION_MENU_ICONS,
             menu_icon="list",
             default_index=0,
-            styles={
-                "container": {
-                    "padding": "0!important",
-                    "background-color": "transparent",
-                },
-                "icon": {"color": "#2e86ab", "font-size": "18px"},
-                "nav-link": {
-                    "font-size": "16px",
-                    "text-align": "left",
-                    "margin": "2px 0px",
-                    "padding": "8px 12px",
-                    "border-radius": "8px",
-                    "background-color": "transparent",
-                    "color": "inherit",
-                    "border": "1px solid transparent",
-                    "--hover-color": "transparent",
-                },
-                "nav-link-selected": {
-                    "background-color": "#2e86ab",
-                    "color": "white",
-                    "border": "1px solid #2e86ab",
-                },
-            },
+            styles=_OPTION_MENU_STYLES,
         )
 
-    # Handle page redirections from session state
-    if "page" in st.session_state and st.session_state.page:
-        # Map the session state page to the selected value
-        page_mapping = {
-            "📄 Upload": "📄 Upload",
-            "📊 Analysis": "📊 Analysis",
-            "💬 Q&A": "💬 Q&A",
-            "📚 Library": "📚 Library",
-            "⚙️ Settings": "⚙️ Settings",
-        }
-
-        if st.session_state.page in page_mapping:
-            selected = st.session_state.page
-            # Clear the page state to prevent continuous redirections
-            del st.session_state.page
+    # Handle page redirections from session state (popped so they fire once)
+    redirect = st.session_state.pop("page", None)
+    if redirect in PAGE_DISPATCH:
+        selected = redirect
 
     # Main content area
-    if selected == "🏠 Home":
-        show_home_page()
-    elif selected == "📄 Upload":
-        show_upload_page()
-    elif selected == "📊 Analysis":
-        show_analysis_page()
-    elif selected == "💬 Q&A":
-        show_qa_page()
-    elif selected == "📚 Library":
-        show_library_page()
-    elif selected == "⚙️ Settings":
-        show_settings_page()
+    PAGE_DISPATCH.get(selected, show_home_page)()
+
+
+@st.cache_data(show_spinner=False)
+def card(kind: str, title: str, body: str, heading: str = "h3") -> str:
+    """Build the HTML for a home-page feature or metric card."""
+    return f'<div class="{kind}"><{heading}>{title}</{heading}><p>{body}</p></div>'
+
+
+PLATFORM_STATS = [
+    ("1,247", "Documents Analyzed"),
+    ("95%", "Accuracy Rate"),
+    ("₹2,000", "Avg. Saved per User"),
+    ("45 sec", "Avg. Processing Time"),
+]
+
+
+@st.cache_data(show_spinner=False)
+def _platform_stats_html() -> str:
+    """Build the Platform Statistics grid as a single HTML block."""
+    cards = "".join(
+        card("metric-card", value, label, heading="h2")
+        for value, label in PLATFORM_STATS
+    )
+    return f'<div class="metric-grid">{cards}</div>'
 
 
 def show_home_page():
@@ -496,87 +167,37 @@ def show_home_page():
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        st.markdown(
-            """
-        <div class="feature-card">
-            <h3>🚀 Instant Analysis</h3>
-            <p>Upload any legal document and get comprehensive analysis in under 60 seconds using Google's Gemini AI.</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
+        st.html(
+            card(
+                "feature-card",
+                "🚀 Instant Analysis",
+                "Upload any legal document and get comprehensive analysis in under 60 seconds using Google's Gemini AI.",
+            )
         )
 
     with col2:
-        st.markdown(
-            """
-        <div class="feature-card">
-            <h3>🎯 Risk Assessment</h3>
-            <p>Color-coded risk scoring helps you identify problematic clauses at a glance with detailed explanations.</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
+        st.html(
+            card(
+                "feature-card",
+                "🎯 Risk Assessment",
+                "Color-coded risk scoring helps you identify problematic clauses at a glance with detailed explanations.",
+            )
         )
 
     with col3:
-        st.markdown(
-            """
-        <div class="feature-card">
-            <h3>💬 Plain Language</h3>
-            <p>Convert complex legal jargon into clear, understandable language that anyone can comprehend.</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
+        st.html(
+            card(
+                "feature-card",
+                "💬 Plain Language",
+                "Convert complex legal jargon into clear, understandable language that anyone can comprehend.",
+            )
         )
 
     # Quick stats
     st.markdown("---")
     st.subheader("📊 Platform Statistics")
 
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.markdown(
-            """
-        <div class="metric-card">
-            <h2>1,247</h2>
-            <p>Documents Analyzed</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
-
-    with col2:
-        st.markdown(
-            """
-        <div class="metric-card">
-            <h2>95%</h2>
-            <p>Accuracy Rate</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
-
-    with col3:
-        st.markdown(
-            """
-        <div class="metric-card">
-            <h2>₹2,000</h2>
-            <p>Avg. Saved per User</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
-
-    with col4:
-        st.markdown(
-            """
-        <div class="metric-card">
-            <h2>45 sec</h2>
-            <p>Avg. Processing Time</p>
-        </div>
-        """,
-            unsafe_allow_html=True,
-        )
+    st.html(_platform_stats_html())
 
     # Getting started
     st.markdown("---")
@@ -602,20 +223,10 @@ def show_home_page():
         st.markdown("Get started with actual legal documents:")
         
         # Get available sample documents
-        sample_dir = "./sample"
-        sample_files = []
-        if os.path.exists(sample_dir):
-            sample_files = [f for f in os.listdir(sample_dir) if f.endswith(('.pdf', '.docx', '.txt'))]
-        
+        sample_files = list_sample_files()
+
         if sample_files:
-            for i, filename in enumerate(sample_files[:4]):  # Show first 4
-                display_name = filename.replace('_', ' ').replace('.pdf', '').replace('.docx', '').replace('.txt', '')
-                display_name = display_name.title()
-                
-                if st.button(f"📄 {display_name}", key=f"home_sample_{i}"):
-                    st.session_state.load_sample = filename
-                    st.session_state.page = "📄 Upload"
-                    st.rerun()
+            _sample_buttons(sample_files)
         else:
             st.info("Sample documents loading...")
 
@@ -626,163 +237,96 @@ def show_home_page():
         st.rerun()
 
 
-def load_sample_document(doc_type: str):
-    """Load a sample document for demonstration."""
-    sample_docs = {
-        "rental": {
-            "filename": "sample_rental_agreement.pdf",
-            "type": "rental",
-            "text": """
-            RESIDENTIAL LEASE AGREEMENT
-            
-            This Lease Agreement is entered into between John Smith (Landlord) and Jane Doe (Tenant) 
-            for the property located at 123 Main Street, Mumbai, Maharashtra.
-            
-            RENT: Tenant agrees to pay Rs. 25,000 per month, due on the 1st of each month. 
-            Late payments will incur a penalty of Rs. 1,000 per day.
-            
-            SECURITY DEPOSIT: Tenant shall pay a security deposit of Rs. 75,000, which is 
-            non-refundable except for damage assessment.
-            
-            TERMINATION: Either party may terminate this lease with 30 days written notice. 
-            Early termination by Tenant results in forfeiture of security deposit.
-            
-            MAINTENANCE: Tenant is responsible for all repairs and maintenance, including 
-            structural repairs, regardless of cause.
-            
-            The property is leased "as-is" with no warranties. Landlord is not liable for 
-            any damages or injuries occurring on the premises.
-            """,
-        },
-        "loan": {
-            "filename": "sample_loan_agreement.pdf",
-            "type": "loan",
-            "text": """
-            PERSONAL LOAN AGREEMENT
-            
-            Borrower: Rajesh Kumar
-            Lender: QuickCash Financial Services Pvt Ltd
-            Principal Amount: Rs. 2,00,000
-            
-            INTEREST RATE: 24% per annum (APR 28.5% including processing fees)
-            
-            REPAYMENT: 24 monthly installments of Rs. 12,500 each
-            Total repayment amount: Rs. 3,00,000
-            
-            LATE PAYMENT PENALTY: Rs. 500 per day for any late payment
-            
-            DEFAULT: If payment is late by more than 7 days, the entire remaining 
-            balance becomes immediately due and payable.
-            
-            COLLATERAL: Borrower pledges gold ornaments worth Rs. 2,50,000 as security.
-            Lender may seize collateral immediately upon default.
-            
-            ARBITRATION: All disputes shall be resolved through binding arbitration. 
-            Borrower waives right to jury trial.
-            
-            Processing fee: Rs. 10,000 (non-refundable)
-            Documentation charges: Rs. 5,000
-            """,
-        },
-        "employment": {
-            "filename": "sample_employment_contract.pdf",
-            "type": "employment",
-            "text": """
-            EMPLOYMENT CONTRACT
-            
-            Employee: Priya Sharma
-            Company: TechCorp India Private Limited
-            Position: Software Developer
-            Start Date: January 1, 2024
-            
-            SALARY: Rs. 8,00,000 per annum, payable monthly
-            
-            WORKING HOURS: 45 hours per week, including mandatory weekend work when required
-            
-            NON-COMPETE: Employee shall not work for any competing company for 2 years 
-            after termination, within India or globally.
-            
-            CONFIDENTIALITY: Employee agrees to maintain strict confidentiality of all 
-            company information indefinitely, even after termination.
-            
-            TERMINATION: Company may terminate employment at any time without cause or notice. 
-            Employee must provide 90 days notice to resign.
-            
-            NO MOONLIGHTING: Employee shall not engage in any other work or business 
-            activities during employment.
-            
-            INTELLECTUAL PROPERTY: All work created by employee belongs entirely to company, 
-            including personal projects done outside work hours.
-            """,
-        },
+SAMPLE_DOCS_PATH = Path(__file__).parent / "src" / "resources" / "sample_docs.json"
+
+
+@st.cache_resource(show_spinner=False)
+def _sample_docs() -> dict:
+    """Load the built-in demo documents once and share them across sessions."""
+    return json.loads(SAMPLE_DOCS_PATH.read_bytes())
+
+
+@st.cache_data(show_spinner=False)
+def _load_sample_cached(doc_type: str) -> Optional[dict]:
+    """Build the session-independent part of a sample document."""
+    sample = _sample_docs().get(doc_type)
+    if sample is None:
+        return None
+
+    return {
+        "filename": sample["filename"],
+        "document_type": sample["type"],
+        "original_text": sample["text"],
     }
 
-    if doc_type in sample_docs:
-        sample = sample_docs[doc_type]
+
+def _sample_buttons(sample_files: tuple[tuple[str, str], ...]):
+    """Home-page sample buttons; a click opens the sample on the upload page."""
+    for i, (filename, display_name) in enumerate(sample_files[:4]):  # Show first 4
+        st.button(
+            f"📄 {display_name}",
+            key=f"home_sample_{i}",
+            on_click=_open_sample,
+            args=(filename,),
+        )
+
+
+def _open_sample(filename: str):
+    """Button callback: load the sample on the upload page in the next run."""
+    st.session_state.load_sample = filename
+    st.session_state.page = "📄 Upload"
+
+
+def load_sample_document(doc_type: str):
+    """Load a sample document for demonstration."""
+    sample = _load_sample_cached(doc_type)
+    if sample:
+        from src.models.document import set_current_document
         from src.utils.helpers import generate_document_id
 
         # Store in session state
-        st.session_state.current_document = {
+        set_current_document({
             "id": generate_document_id(),
-            "filename": sample["filename"],
-            "document_type": sample["type"],
-            "original_text": sample["text"],
+            **sample,
             "is_sample": True,
-        }
+        })
 
         st.success(f"📄 Loaded sample {doc_type} document!")
         st.session_state.page = "📊 Analysis"
         st.rerun()
 
 
-def show_upload_page():
-    """Import and show the upload page."""
-    try:
-        from src.pages.upload import show_upload_interface
-
-        show_upload_interface()
-    except ImportError as e:
-        st.error(f"Upload page not found: {e}")
-
-
-def show_analysis_page():
-    """Import and show the analysis page."""
-    try:
-        from src.pages.analysis import show_analysis_interface
-
-        show_analysis_interface()
-    except ImportError as e:
-        st.error(f"Analysis page not found: {e}")
+# Page label -> (module in src.pages, entry point)
+PAGES = {
+    "📄 Upload": ("upload", "show_upload_interface"),
+    "📊 Analysis": ("analysis", "show_analysis_interface"),
+    "💬 Q&A": ("qa_assistant", "show_qa_interface"),
+    "📚 Library": ("library", "show_library_interface"),
+    "⚙️ Settings": ("settings", "show_settings_interface"),
+}
 
 
-def show_qa_page():
-    """Import and show the Q&A page."""
-    try:
-        from src.pages.qa_assistant import show_qa_interface
-
-        show_qa_interface()
-    except ImportError as e:
-        st.error(f"Q&A page not found: {e}")
+@functools.lru_cache(maxsize=None)
+def _load_page(module_name: str, func_name: str) -> Callable[[], None]:
+    """Import a page module once and return its entry point."""
+    module = importlib.import_module(f"src.pages.{module_name}")
+    return getattr(module, func_name)
 
 
-def show_library_page():
-    """Import and show the library page."""
+def show_page(selected: str):
+    """Import and show one of the pages registered in PAGES."""
     try:
-        from src.pages.library import show_library_interface
-
-        show_library_interface()
+        page = _load_page(*PAGES[selected])
+        # Pages may import more modules lazily while rendering
+        page()
     except ImportError as e:
-        st.error(f"Library page not found: {e}")
+        st.error(f"{selected.split(' ', 1)[-1]} page not found: {e}")
 
 
-def show_settings_page():
-    """Import and show the settings page."""
-    try:
-        from src.pages.settings import show_settings_interface
-
-        show_settings_interface()
-    except ImportError as e:
-        st.error(f"Settings page not found: {e}")
+PAGE_DISPATCH: dict[str, Callable[[], None]] = {
+    "🏠 Home": show_home_page,
+    **{label: functools.partial(show_page, label) for label in PAGES},
+}
 
 
 if __name__ == "__main__":
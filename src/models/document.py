@@ -1,9 +1,15 @@
-from pydantic import BaseModel, Field
+import streamlit as st
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 
 
+def utc_now() -> datetime:
+    """Timezone-aware UTC timestamp used as the default for model timestamps."""
+    return datetime.now(timezone.utc)
+
+
 class DocumentType(str, Enum):
     RENTAL = "rental"
     LOAN = "loan"
@@ -28,12 +34,16 @@ class RiskCategory(str, Enum):
 
 
 class ClausePosition(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     start_index: int
     end_index: int
     page_number: Optional[int] = None
 
 
 class RiskFactor(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: str
     clause_text: str
     category: RiskCategory
@@ -43,6 +53,10 @@ class RiskFactor(BaseModel):
     position: Optional[ClausePosition] = None
 
 
+# Validates a whole list of LLM-produced risk factors in one pydantic-core call
+RiskFactorList = TypeAdapter(List[RiskFactor])
+
+
 class DocumentAnalysis(BaseModel):
     document_id: str
     document_type: DocumentType
@@ -52,7 +66,7 @@ class DocumentAnalysis(BaseModel):
     risk_factors: List[RiskFactor] = []
     key_dates: List[Dict[str, Any]] = []
     financial_terms: Dict[str, Any] = {}
-    created_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=utc_now)
 
 
 class Document(BaseModel):
@@ -61,7 +75,7 @@ class Document(BaseModel):
     file_path: str
     document_type: Optional[DocumentType] = None
     file_size: int
-    upload_timestamp: datetime = Field(default_factory=datetime.now)
+    upload_timestamp: datetime = Field(default_factory=utc_now)
     analysis: Optional[DocumentAnalysis] = None
     processed: bool = False
 
@@ -71,7 +85,7 @@ class QASession(BaseModel):
     document_id: str
     question: str
     answer: str
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: datetime = Field(default_factory=utc_now)
     confidence_score: Optional[float] = None
 
 
@@ -86,3 +100,38 @@ class SimplificationResponse(BaseModel):
     simplified_text: str
     key_points: List[str] = []
     jargon_definitions: Dict[str, str] = {}
+
+
+def document_store() -> Dict[str, Dict[str, Any]]:
+    """The session's analysed documents keyed by their UUID.
+
+    Held in session state, so entries live as long as the session. Entries
+    are returned by reference, so long document texts are never hashed or
+    copied the way st.cache_data arguments would be.
+    """
+    return st.session_state.setdefault("document_store", {})
+
+
+# Fields kept in st.session_state.current_document; everything else (text,
+# analysis results) is looked up in document_store()
+_CURRENT_DOCUMENT_FIELDS = ("id", "filename", "document_type")
+
+
+def set_current_document(doc: Dict[str, Any]) -> None:
+    """Store doc in document_store() and make it the session's current document."""
+    document_store()[doc["id"]] = doc
+    st.session_state.current_document = {
+        field: doc[field] for field in _CURRENT_DOCUMENT_FIELDS if field in doc
+    }
+
+
+def get_current_document() -> Optional[Dict[str, Any]]:
+    """Return the full stored entry for the session's current document.
+
+    Returns None when there is no current document, or when its entry is no
+    longer in document_store() (the document was deleted).
+    """
+    ref = st.session_state.get("current_document")
+    if not ref:
+        return None
+    return document_store().get(ref["id"])
@@ -1,20 +1,56 @@
 import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
+import pandas as pd
+from datetime import datetime
 from typing import Dict, Any
+import functools
+import io
+import operator
+import os
+import re
 import time
 
-from ..utils.helpers import get_risk_color, extract_financial_terms, extract_key_dates
+from ..models.document import (
+    document_store,
+    get_current_document,
+    set_current_document,
+)
+from ..utils.helpers import (
+    format_file_size,
+    get_risk_color,
+    get_risk_level,
+    extract_all,
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _jargon_pattern(terms: frozenset, ignore_case: bool = False) -> re.Pattern:
+    """Compile one word-bounded alternation over all jargon terms, longest first."""
+    alternation = "|".join(
+        re.escape(term) for term in sorted(terms, key=lambda t: (-len(t), t))
+    )
+    return re.compile(
+        r"\b(?:" + alternation + r")\b", re.IGNORECASE if ignore_case else 0
+    )
+
+
+# Tooltip text goes into a title="..." attribute: swap double quotes and
+# escape angle brackets in a single pass
+_TOOLTIP_ESCAPE = str.maketrans({'"': "'", "<": "&lt;", ">": "&gt;"})
 
+# Highlight spans are (start, end, html) tuples; sort on start only so ties
+# keep their insertion order (risk before jargon)
+_span_start = operator.itemgetter(0)
 
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
 def create_advanced_highlighting(
     text: str, risk_factors: list, jargon_definitions: dict
 ) -> str:
     """Create advanced highlighting with hover tooltips for clauses and jargon."""
-    import re
-    
-    highlighted_text = text
-    processed_positions = []  # Track processed positions to avoid overlaps
+    if not risk_factors and not jargon_definitions:
+        return text
     
     # First, collect all risk factors and their positions
     risk_replacements = []
@@ -26,95 +62,104 @@ def create_advanced_highlighting(
         # Clean and limit clause text
         clause_text = clause_text.strip()[:150]  # Increase limit slightly
         
-        # Find the position in text
-        start_pos = highlighted_text.find(clause_text)
+        # Find the position in the original text
+        start_pos = text.find(clause_text)
         if start_pos != -1:
             end_pos = start_pos + len(clause_text)
             
             severity = factor.get("severity", "low")
-            explanation = factor.get("explanation", "")[:200]  # Limit explanation
-            suggestion = factor.get("suggestion", "")[:200]  # Limit suggestion
+            explanation = (factor.get("explanation") or "")[:200]  # Limit explanation
+            suggestion = (factor.get("suggestion") or "")[:200]  # Limit suggestion
             
             # Clean the text content for HTML (escape quotes and special chars)
-            clean_explanation = explanation.replace('"', "'").replace('<', '&lt;').replace('>', '&gt;')
-            clean_suggestion = suggestion.replace('"', "'").replace('<', '&lt;').replace('>', '&gt;')
+            clean_explanation = explanation.translate(_TOOLTIP_ESCAPE)
+            clean_suggestion = suggestion.translate(_TOOLTIP_ESCAPE)
             
             tooltip_content = f"⚠️ Risk: {severity.upper()}<br>📝 {clean_explanation}"
             if clean_suggestion:
                 tooltip_content += f"<br>💡 Suggestion: {clean_suggestion}"
             
-            risk_replacements.append({
-                'start': start_pos,
-                'end': end_pos,
-                'original': clause_text,
-                'replacement': f'<span class="tooltip risk-{severity}" title="{tooltip_content}">{clause_text}</span>',
-                'type': 'risk'
-            })
+            risk_replacements.append((
+                start_pos,
+                end_pos,
+                f'<span class="tooltip risk-{severity}" title="{tooltip_content}">{clause_text}</span>',
+            ))
     
-    # Sort by position (reverse order to maintain positions when replacing)
-    risk_replacements.sort(key=lambda x: x['start'], reverse=True)
-    
-    # Apply risk replacements
-    for replacement in risk_replacements:
-        start, end = replacement['start'], replacement['end']
-        highlighted_text = (
-            highlighted_text[:start] + 
-            replacement['replacement'] + 
-            highlighted_text[end:]
-        )
-        processed_positions.extend(range(start, end))
+    # Mark risk spans in a per-character mask so jargon inside them is skipped
+    risk_mask = bytearray(len(text))
+    for start, end, _ in risk_replacements:
+        risk_mask[start:end] = b'\x01' * (end - start)
     
-    # Then highlight jargon terms (but avoid areas already processed)
-    jargon_replacements = []
+    # Then find jargon terms in the original text (but avoid risk spans)
+    jargon_lookup = {}
     for term, definition in jargon_definitions.items():
         if len(term) < 3:  # Skip very short terms
             continue
             
         # Clean definition for HTML
-        clean_definition = definition.replace('"', "'").replace('<', '&lt;').replace('>', '&gt;')[:150]
-        
-        # Find all occurrences of the term (case-insensitive)
-        pattern = re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE)
+        clean_definition = definition.translate(_TOOLTIP_ESCAPE)[:150]
+        jargon_lookup.setdefault(term.lower(), (term, clean_definition))
+    
+    jargon_replacements = []
+    if jargon_lookup:
+        # One scan for all terms at once. Match lower-cased terms against the
+        # lower-cased text so the regex needs no case folding; lower() can
+        # change the length of a few characters, in which case offsets would
+        # drift and we fall back to IGNORECASE on the original text.
+        text_lower = text.lower()
+        if len(text_lower) == len(text):
+            pattern = _jargon_pattern(frozenset(jargon_lookup))
+            scan_text = text_lower
+        else:
+            pattern = _jargon_pattern(frozenset(jargon_lookup), ignore_case=True)
+            scan_text = text
         
-        for match in pattern.finditer(highlighted_text):
+        for match in pattern.finditer(scan_text):
             start_pos, end_pos = match.span()
             
-            # Check if this position overlaps with existing highlights
-            if any(pos in processed_positions for pos in range(start_pos, end_pos)):
+            # Check if this position overlaps with existing highlights (find
+            # searches the mask in place instead of copying a slice)
+            if risk_mask.find(1, start_pos, end_pos) != -1:
                 continue
+            
+            entry = jargon_lookup.get(match.group().lower())
+            if entry is None:
+                continue
+            term, clean_definition = entry
                 
-            # Check if we're inside an HTML tag
-            before_text = highlighted_text[:start_pos]
-            if before_text.count('<span') > before_text.count('</span>'):
-                continue  # We're inside a span, skip
-                
-            jargon_replacements.append({
-                'start': start_pos,
-                'end': end_pos,
-                'original': match.group(),
-                'replacement': f'<span class="tooltip jargon-term" title="📚 {term}: {clean_definition}">{match.group()}</span>',
-                'type': 'jargon'
-            })
-    
-    # Sort jargon replacements by position (reverse order)
-    jargon_replacements.sort(key=lambda x: x['start'], reverse=True)
+            jargon_replacements.append((
+                start_pos,
+                end_pos,
+                f'<span class="tooltip jargon-term" title="📚 {term}: {clean_definition}">{text[start_pos:end_pos]}</span>',
+            ))
+            
+            # Matches arrive in document order; stop at the first 5 to avoid
+            # clutter
+            if len(jargon_replacements) >= 5:
+                break
     
-    # Apply jargon replacements (limit to 5 to avoid clutter)
-    for replacement in jargon_replacements[:5]:
-        start, end = replacement['start'], replacement['end']
-        highlighted_text = (
-            highlighted_text[:start] + 
-            replacement['replacement'] + 
-            highlighted_text[end:]
-        )
+    # Build the output in one pass over the spans in document order, dropping
+    # any span that overlaps one already placed
+    replacements = risk_replacements + jargon_replacements
+    replacements.sort(key=_span_start)
+    parts = []
+    cursor = 0
+    for start, end, html in replacements:
+        if start < cursor:
+            continue
+        parts.append(text[cursor:start])
+        parts.append(html)
+        cursor = end
+    parts.append(text[cursor:])
     
-    return highlighted_text
+    return ''.join(parts)
 
 
 def show_analysis_interface():
     """Display the document analysis interface."""
 
-    if not st.session_state.get("current_document"):
+    doc = get_current_document()
+    if not doc:
         st.info("📊 **Document Analysis Page**")
         st.markdown("### No document selected for analysis")
         st.markdown("""
@@ -153,13 +198,11 @@ def show_analysis_interface():
                 with col2:
                     if st.button(f"View Analysis", key=f"view_{doc.get('id')}", use_container_width=True):
                         # Load this document for analysis
-                        st.session_state.current_document = doc
+                        set_current_document(document_store().get(doc["id"], doc))
                         st.rerun()
         
         return
 
-    doc = st.session_state.current_document
-
     # Header
     st.header("📊 Document Analysis")
     st.markdown(
@@ -186,31 +229,23 @@ def show_analysis_interface():
     # Additional Analysis Sections
     st.markdown("---")
 
-    # Tabs for different analysis views
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(
-        [
-            "📋 Summary",
-            "⚠️ Risk Factors",
-            "📅 Key Dates",
-            "💰 Financial Terms",
-            "📊 Market Comparison",
-        ]
+    # Pseudo-tabs: st.tabs runs every tab body on each rerun, so only the
+    # selected view is rendered here
+    analysis_views = {
+        "📋 Summary": show_document_summary,
+        "⚠️ Risk Factors": show_risk_factors,
+        "📅 Key Dates": show_key_dates,
+        "💰 Financial Terms": show_financial_terms,
+        "📊 Market Comparison": show_market_comparison,
+    }
+    active_view = st.radio(
+        "Analysis view",
+        list(analysis_views),
+        key="analysis_view",
+        horizontal=True,
+        label_visibility="collapsed",
     )
-
-    with tab1:
-        show_document_summary(doc)
-
-    with tab2:
-        show_risk_factors(doc)
-
-    with tab3:
-        show_key_dates(doc)
-
-    with tab4:
-        show_financial_terms(doc)
-
-    with tab5:
-        show_market_comparison(doc)
+    analysis_views.get(active_view, show_document_summary)(doc)
 
     # Action buttons
     st.markdown("---")
@@ -234,34 +269,26 @@ def show_analysis_interface():
 
 def process_sample_document(doc):
     """Process a sample document with simulated AI analysis."""
-    st.info("🤖 Processing sample document with AI analysis...")
-
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-
-    # Simulate processing steps
-    steps = [
-        ("📄 Extracting text...", 20),
-        ("🔍 Detecting document type...", 40),
-        ("⚠️ Analyzing risks...", 60),
-        ("💬 Simplifying language...", 80),
-        ("📋 Generating summary...", 100),
-    ]
-
-    for step_text, progress in steps:
-        status_text.text(step_text)
-        progress_bar.progress(progress)
-        time.sleep(0.5)
-
-    # Generate mock analysis results
-    doc_type = doc.get("document_type", "other")
+    with st.status(
+        "🤖 Processing sample document with AI analysis...", expanded=True
+    ) as status:
+        # Generate mock analysis results
+        doc_type = doc.get("document_type", "other")
 
-    # Mock risk factors based on document type
-    risk_factors = generate_mock_risk_factors(doc_type)
-    simplified_text = generate_mock_simplified_text(
-        doc.get("original_text", ""), doc_type
-    )
-    summary = generate_mock_summary(doc_type)
+        # Mock risk factors based on document type
+        st.write("⚠️ Analyzing risks...")
+        risk_factors = generate_mock_risk_factors(doc_type)
+        risk_score = min(len(risk_factors) * 15, 100)
+
+        st.write("💬 Simplifying language...")
+        simplified_text = generate_mock_simplified_text(
+            doc.get("original_text", ""), doc_type
+        )
+
+        st.write("📋 Generating summary...")
+        summary = generate_mock_summary(doc_type)
+
+        status.update(label="✅ Analysis complete!", state="complete")
 
     # Update document with analysis
     doc.update(
@@ -281,60 +308,65 @@ def process_sample_document(doc):
                 "Liability": "Legal responsibility for damages",
                 "Arbitration": "Dispute resolution outside of court",
             },
+            "risk_score": risk_score,
+            "risk_level": get_risk_level(risk_score),
             "processed": True,
             "analysis_timestamp": time.time(),
         }
     )
 
-    st.session_state.current_document = doc
-
-    progress_bar.empty()
-    status_text.empty()
-    st.success("✅ Analysis complete!")
-    time.sleep(1)
+    # doc is the stored entry, so the update above is already persisted
     st.rerun()
 
 
+@st.cache_resource(show_spinner=False)
+def _build_risk_gauge(risk_score: int) -> go.Figure:
+    """Build the risk score gauge, shared across reruns for the same score."""
+    fig = go.Figure(
+        go.Indicator(
+            mode="gauge+number+delta",
+            value=risk_score,
+            domain={"x": [0, 1], "y": [0, 1]},
+            title={"text": "Risk Score"},
+            delta={"reference": 50},
+            gauge={
+                "axis": {"range": [None, 100]},
+                "bar": {"color": get_risk_color(risk_score)},
+                "steps": [
+                    {"range": [0, 25], "color": "lightgray"},
+                    {"range": [25, 50], "color": "gray"},
+                    {"range": [50, 75], "color": "lightcoral"},
+                    {"range": [75, 100], "color": "red"},
+                ],
+                "threshold": {
+                    "line": {"color": "red", "width": 4},
+                    "thickness": 0.75,
+                    "value": 90,
+                },
+            },
+        )
+    )
+
+    fig.update_layout(height=300)
+    return fig
+
+
 def show_risk_dashboard(doc):
     """Display the risk assessment dashboard."""
     risk_data = doc.get("risk_data", {})
     risk_factors = risk_data.get("risk_factors", [])
 
-    # Calculate risk score
-    risk_score = min(len(risk_factors) * 15, 100)
+    # Score is derived once per document and kept on the doc dict
+    if "risk_level" not in doc:
+        doc["risk_score"] = min(len(risk_factors) * 15, 100)
+        doc["risk_level"] = get_risk_level(doc["risk_score"])
+    risk_score = doc["risk_score"]
 
     # Risk score gauge
     col1, col2, col3 = st.columns([2, 1, 1])
 
     with col1:
-        # Create gauge chart
-        fig = go.Figure(
-            go.Indicator(
-                mode="gauge+number+delta",
-                value=risk_score,
-                domain={"x": [0, 1], "y": [0, 1]},
-                title={"text": "Risk Score"},
-                delta={"reference": 50},
-                gauge={
-                    "axis": {"range": [None, 100]},
-                    "bar": {"color": get_risk_color(risk_score)},
-                    "steps": [
-                        {"range": [0, 25], "color": "lightgray"},
-                        {"range": [25, 50], "color": "gray"},
-                        {"range": [50, 75], "color": "lightcoral"},
-                        {"range": [75, 100], "color": "red"},
-                    ],
-                    "threshold": {
-                        "line": {"color": "red", "width": 4},
-                        "thickness": 0.75,
-                        "value": 90,
-                    },
-                },
-            )
-        )
-
-        fig.update_layout(height=300)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_build_risk_gauge(risk_score), use_container_width=True)
 
     with col2:
         st.metric(
@@ -344,18 +376,9 @@ def show_risk_dashboard(doc):
         )
 
     with col3:
-        risk_level = (
-            "Low"
-            if risk_score < 25
-            else (
-                "Medium"
-                if risk_score < 50
-                else "High" if risk_score < 75 else "Critical"
-            )
-        )
         st.metric(
             label="Risk Level",
-            value=risk_level,
+            value=doc["risk_level"],
             delta_color="inverse" if risk_score > 50 else "normal",
         )
 
@@ -372,72 +395,16 @@ def show_original_document(doc):
     risk_factors = doc.get("risk_data", {}).get("risk_factors", [])
     jargon_definitions = doc.get("jargon_definitions", {})
 
-    # Advanced highlighting with hover tooltips
-    highlighted_text = create_advanced_highlighting(
-        original_text, risk_factors, jargon_definitions
-    )
-
-    # Custom CSS for hover tooltips with responsive theming
-    st.markdown(
-        """
-    <style>
-    .tooltip {
-        position: relative;
-        display: inline;
-        cursor: help;
-        border-radius: 4px;
-        padding: 2px 4px;
-        margin: 0 1px;
-    }
-    
-    /* Risk highlighting with theme-aware backgrounds */
-    .risk-critical { 
-        background-color: rgba(255, 68, 68, 0.2); 
-        border-left: 4px solid #ff4444; 
-        padding: 4px 8px;
-        border-radius: 4px;
-        cursor: help;
-    }
-    .risk-high { 
-        background-color: rgba(255, 136, 0, 0.2); 
-        border-left: 4px solid #ff8800; 
-        padding: 4px 8px;
-        border-radius: 4px;
-        cursor: help;
-    }
-    .risk-medium { 
-        background-color: rgba(255, 204, 0, 0.2); 
-        border-left: 4px solid #ffcc00; 
-        padding: 4px 8px;
-        border-radius: 4px;
-        cursor: help;
-    }
-    .risk-low { 
-        background-color: rgba(68, 170, 68, 0.2); 
-        border-left: 4px solid #44aa44; 
-        padding: 4px 8px;
-        border-radius: 4px;
-        cursor: help;
-    }
-    
-    /* Jargon term highlighting */
-    .jargon-term { 
-        background-color: rgba(46, 134, 171, 0.2); 
-        text-decoration: underline dotted #2e86ab;
-        padding: 2px 4px;
-        border-radius: 3px;
-        cursor: help;
-    }
-    
-    /* Enhanced tooltips */
-    .tooltip:hover {
-        opacity: 0.8;
-    }
-    </style>
-    """,
-        unsafe_allow_html=True,
-    )
+    # Advanced highlighting with hover tooltips (skipped entirely, including
+    # the cache lookup that hashes the text, when there is nothing to mark)
+    if risk_factors or jargon_definitions:
+        highlighted_text = create_advanced_highlighting(
+            original_text, risk_factors, jargon_definitions
+        )
+    else:
+        highlighted_text = original_text
 
+    # Tooltip/risk styles come from the global stylesheet (static/lega.css)
     st.markdown(highlighted_text, unsafe_allow_html=True)
 
     # Scroll area for long documents
@@ -483,14 +450,10 @@ def show_document_summary(doc):
 
     with col2:
         if doc.get("file_size"):
-            from ..utils.helpers import format_file_size
-
             st.markdown(f"**Size:** {format_file_size(doc['file_size'])}")
 
         if doc.get("analysis_timestamp"):
-            import datetime
-
-            analysis_time = datetime.datetime.fromtimestamp(doc["analysis_timestamp"])
+            analysis_time = datetime.fromtimestamp(doc["analysis_timestamp"])
             st.markdown(f"**Analyzed:** {analysis_time.strftime('%Y-%m-%d %H:%M')}")
 
 
@@ -525,10 +488,105 @@ def show_risk_factors(doc):
         st.markdown("---")
 
 
+# Mock timeline & obligations per document type
+TIMELINE_ITEMS = {
+    "rental": [
+        {
+            "date": "1st of every month",
+            "event": "Rent Payment Due",
+            "type": "recurring",
+        },
+        {
+            "date": "30 days notice",
+            "event": "Termination Notice Required",
+            "type": "condition",
+        },
+        {
+            "date": "End of lease",
+            "event": "Security Deposit Return",
+            "type": "deadline",
+        },
+    ],
+    "loan": [
+        {
+            "date": "15th of every month",
+            "event": "EMI Payment Due",
+            "type": "recurring",
+        },
+        {
+            "date": "7 days after due",
+            "event": "Late Fee Applicable",
+            "type": "penalty",
+        },
+        {"date": "24 months", "event": "Loan Maturity", "type": "deadline"},
+    ],
+    "employment": [
+        {
+            "date": "Last day of month",
+            "event": "Salary Payment",
+            "type": "recurring",
+        },
+        {
+            "date": "90 days",
+            "event": "Resignation Notice Period",
+            "type": "condition",
+        },
+        {
+            "date": "2 years post-termination",
+            "event": "Non-compete Expires",
+            "type": "deadline",
+        },
+    ],
+}
+
+
+TIMELINE_ICONS = {"recurring": "🔄", "penalty": "⚠️", "deadline": "📅"}
+
+
+@st.cache_resource(show_spinner=False)
+def _build_timeline(doc_type: str) -> go.Figure:
+    """Build the visual timeline for a document type, shared across reruns."""
+    df = pd.DataFrame(
+        [
+            {
+                "Event": item["event"],
+                "Timeline": item["date"],
+                "Type": item["type"].title(),
+                "Order": i,
+            }
+            for i, item in enumerate(TIMELINE_ITEMS.get(doc_type, []))
+        ]
+    )
+
+    # Color code by type
+    color_map = {
+        "Recurring": "#2e86ab",
+        "Penalty": "#ff4444",
+        "Deadline": "#ff8800",
+        "Condition": "#44aa44",
+    }
+
+    return px.timeline(
+        df,
+        x_start=[0] * len(df),
+        x_end=[1] * len(df),
+        y="Event",
+        color="Type",
+        color_discrete_map=color_map,
+        title="Contract Timeline & Obligations",
+    )
+
+
+def _ensure_extracted_terms(doc):
+    """Extract key dates and financial terms once and keep them on the doc dict."""
+    if "key_dates" not in doc or "financial_terms" not in doc:
+        doc.update(extract_all(doc.get("original_text", "")))
+
+
 def show_key_dates(doc):
     """Display extracted key dates with timeline visualization."""
-    original_text = doc.get("original_text", "")
-    dates = extract_key_dates(original_text)
+    _ensure_extracted_terms(doc)
+    dates = doc["key_dates"]
 
     if not dates:
         st.info("No specific dates found in this document.")
@@ -538,125 +596,38 @@ def show_key_dates(doc):
     col1, col2 = st.columns([1, 1])
 
     with col1:
-        st.markdown("**Important Dates Found:**")
-        for date_info in dates:
-            st.markdown(f"• **{date_info['date']}** - Context: {date_info['context']}")
+        st.markdown(
+            "\n\n".join(
+                ["**Important Dates Found:**"]
+                + [
+                    f"• **{date_info['date']}** - Context: {date_info['context']}"
+                    for date_info in dates
+                ]
+            )
+        )
 
     with col2:
-        st.markdown("**Timeline & Obligations:**")
-
         # Mock timeline data based on document type
         doc_type = doc.get("document_type", "other")
+        timeline_items = TIMELINE_ITEMS.get(doc_type, [])
 
-        if doc_type == "rental":
-            timeline_items = [
-                {
-                    "date": "1st of every month",
-                    "event": "Rent Payment Due",
-                    "type": "recurring",
-                },
-                {
-                    "date": "30 days notice",
-                    "event": "Termination Notice Required",
-                    "type": "condition",
-                },
-                {
-                    "date": "End of lease",
-                    "event": "Security Deposit Return",
-                    "type": "deadline",
-                },
-            ]
-        elif doc_type == "loan":
-            timeline_items = [
-                {
-                    "date": "15th of every month",
-                    "event": "EMI Payment Due",
-                    "type": "recurring",
-                },
-                {
-                    "date": "7 days after due",
-                    "event": "Late Fee Applicable",
-                    "type": "penalty",
-                },
-                {"date": "24 months", "event": "Loan Maturity", "type": "deadline"},
-            ]
-        elif doc_type == "employment":
-            timeline_items = [
-                {
-                    "date": "Last day of month",
-                    "event": "Salary Payment",
-                    "type": "recurring",
-                },
-                {
-                    "date": "90 days",
-                    "event": "Resignation Notice Period",
-                    "type": "condition",
-                },
-                {
-                    "date": "2 years post-termination",
-                    "event": "Non-compete Expires",
-                    "type": "deadline",
-                },
-            ]
-        else:
-            timeline_items = []
-
+        lines = ["**Timeline & Obligations:**"]
         for item in timeline_items:
-            if item["type"] == "recurring":
-                st.markdown(f"🔄 **{item['date']}**: {item['event']}")
-            elif item["type"] == "penalty":
-                st.markdown(f"⚠️ **{item['date']}**: {item['event']}")
-            elif item["type"] == "deadline":
-                st.markdown(f"📅 **{item['date']}**: {item['event']}")
-            else:
-                st.markdown(f"📌 **{item['date']}**: {item['event']}")
+            icon = TIMELINE_ICONS.get(item["type"], "📌")
+            lines.append(f"{icon} **{item['date']}**: {item['event']}")
+        st.markdown("\n\n".join(lines))
 
     # Visual timeline chart
     if timeline_items:
         st.markdown("---")
         st.markdown("**📊 Visual Timeline**")
-
-        # Create timeline visualization
-        timeline_df = []
-        for i, item in enumerate(timeline_items):
-            timeline_df.append(
-                {
-                    "Event": item["event"],
-                    "Timeline": item["date"],
-                    "Type": item["type"].title(),
-                    "Order": i,
-                }
-            )
-
-        if timeline_df:
-            import pandas as pd
-
-            df = pd.DataFrame(timeline_df)
-
-            # Color code by type
-            color_map = {
-                "Recurring": "#2e86ab",
-                "Penalty": "#ff4444",
-                "Deadline": "#ff8800",
-                "Condition": "#44aa44",
-            }
-
-            fig = px.timeline(
-                df,
-                x_start=[0] * len(df),
-                x_end=[1] * len(df),
-                y="Event",
-                color="Type",
-                color_discrete_map=color_map,
-                title="Contract Timeline & Obligations",
-            )
-            st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_build_timeline(doc_type), use_container_width=True)
 
 
 def show_financial_terms(doc):
     """Display extracted financial terms."""
-    original_text = doc.get("original_text", "")
-    financial_terms = extract_financial_terms(original_text)
+    _ensure_extracted_terms(doc)
+    financial_terms = doc["financial_terms"]
 
     if not financial_terms:
         st.info("No financial terms identified in this document.")
@@ -685,7 +656,8 @@ def show_financial_terms(doc):
 def export_report(doc):
     """Export analysis report."""
     # Create a simple text report
-    report = f"""
+    buf = io.StringIO()
+    buf.write(f"""
 LEGA.AI DOCUMENT ANALYSIS REPORT
 {'='*50}
 
@@ -700,50 +672,46 @@ RISK ASSESSMENT:
 {doc.get('risk_data', {}).get('overall_assessment', 'No risk assessment available')}
 
 RISK FACTORS:
-"""
+""")
 
     risk_factors = doc.get("risk_data", {}).get("risk_factors", [])
     for i, factor in enumerate(risk_factors):
-        report += f"""
+        buf.write(f"""
 {i+1}. {factor.get('severity', 'Unknown').upper()} RISK
    Category: {factor.get('category', 'N/A').title()}
    Clause: {factor.get('clause_text', 'N/A')}
    Explanation: {factor.get('explanation', 'N/A')}
-"""
+""")
 
-    report += f"""
+    buf.write(f"""
 
 SIMPLIFIED VERSION:
 {doc.get('simplified_text', 'No simplified version available')}
 
 KEY POINTS:
-"""
+""")
 
     for point in doc.get("key_points", []):
-        report += f"• {point}\n"
+        buf.write(f"• {point}\n")
 
-    report += "\n\nGenerated by Lega.AI - Making legal documents accessible"
+    buf.write("\n\nGenerated by Lega.AI - Making legal documents accessible")
+    report = buf.getvalue()
 
-    # Clean filename - remove .pdf extension if present
-    filename = doc.get('filename', 'document')
-    if filename.endswith('.pdf'):
-        filename = filename[:-4]
-    if filename.endswith('.docx'):
-        filename = filename[:-5]
-    if filename.endswith('.txt'):
-        filename = filename[:-4]
+    # Clean filename - drop the extension (.pdf, .docx, .txt, ...)
+    filename = os.path.splitext(doc.get('filename', 'document'))[0]
 
     # Offer download
     st.download_button(
         label="📥 Download Report",
         data=report,
-        file_name=f"lega_ai_report_{filename}.pdf",
-        mime="application/pdf",
+        file_name=f"lega_ai_report_{filename}.txt",
+        mime="text/plain",
     )
 
     st.success("✅ Report prepared for download!")
 
 
+@st.cache_data(show_spinner=False, persist="disk")
 def generate_mock_risk_factors(doc_type):
     """Generate mock risk factors for sample documents."""
     if doc_type == "rental":
@@ -801,6 +769,7 @@ def generate_mock_risk_factors(doc_type):
         return []
 
 
+@st.cache_data(show_spinner=False, persist="disk")
 def generate_mock_simplified_text(original_text, doc_type):
     """Generate mock simplified text."""
     if doc_type == "rental":
@@ -884,8 +853,7 @@ def show_rental_market_comparison(doc):
     col1, col2 = st.columns(2)
 
     with col1:
-        st.markdown("#### 🏠 Rental Market Analysis")
-        st.markdown("**Security Deposit:** ₹75,000")
+        st.markdown("#### 🏠 Rental Market Analysis\n\n**Security Deposit:** ₹75,000")
         st.success("✅ Standard: Typically 2-3 months rent")
 
         st.markdown("**Late Penalty:** ₹1,000/day")
@@ -905,8 +873,22 @@ def show_rental_market_comparison(doc):
             "Tenant Maintenance": "10% of agreements",
         }
 
-        for metric, value in market_data.items():
-            st.metric(metric, value)
+        st.dataframe(
+            pd.DataFrame(list(market_data.items()), columns=["Metric", "Value"]),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+
+@st.cache_resource(show_spinner=False)
+def _loan_comparison_fig() -> go.Figure:
+    """Build the static interest rate comparison chart once."""
+    return px.bar(
+        x=["Your Loan", "Bank Average", "NBFC Average"],
+        y=[24, 12, 18],
+        title="Interest Rate Comparison (%)",
+        color=["red", "green", "orange"],
+    )
 
 
 def show_loan_market_comparison(doc):
@@ -914,8 +896,7 @@ def show_loan_market_comparison(doc):
     col1, col2 = st.columns(2)
 
     with col1:
-        st.markdown("#### 💰 Loan Market Analysis")
-        st.markdown("**Interest Rate:** 24% per annum")
+        st.markdown("#### 💰 Loan Market Analysis\n\n**Interest Rate:** 24% per annum")
         st.error("❌ Well Above Market: Bank rates typically 10-15%")
 
         st.markdown("**Processing Fee:** ₹10,000")
@@ -928,13 +909,7 @@ def show_loan_market_comparison(doc):
         st.markdown("#### 📊 Personal Loan Benchmarks")
 
         # Create comparison chart
-        fig = px.bar(
-            x=["Your Loan", "Bank Average", "NBFC Average"],
-            y=[24, 12, 18],
-            title="Interest Rate Comparison (%)",
-            color=["red", "green", "orange"],
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_loan_comparison_fig(), use_container_width=True)
 
 
 def show_employment_market_comparison(doc):
@@ -942,8 +917,7 @@ def show_employment_market_comparison(doc):
     col1, col2 = st.columns(2)
 
     with col1:
-        st.markdown("#### 💼 Employment Market Analysis")
-        st.markdown("**Non-compete Period:** 2 years")
+        st.markdown("#### 💼 Employment Market Analysis\n\n**Non-compete Period:** 2 years")
         st.error("❌ Excessive: Typical non-compete is 6-12 months")
 
         st.markdown("**Notice Period:** 90 days")
@@ -962,10 +936,14 @@ def show_employment_market_comparison(doc):
             "Weekend Work": "Occasionally, not mandatory",
         }
 
-        for standard, value in standards.items():
-            st.metric(standard, value)
+        st.dataframe(
+            pd.DataFrame(list(standards.items()), columns=["Standard", "Value"]),
+            hide_index=True,
+            use_container_width=True,
+        )
 
 
+@st.cache_data(show_spinner=False, persist="disk")
 def generate_mock_summary(doc_type):
     """Generate mock summary."""
     if doc_type == "rental":
@@ -1,9 +1,12 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional
 import time
 
-from ..utils.helpers import format_file_size, format_timestamp
+from ..models.document import document_store, set_current_document
+from ..utils.helpers import format_file_size
+from ..utils.samples import list_sample_files
 
 
 def show_library_interface():
@@ -19,6 +22,11 @@ def show_library_interface():
         show_empty_library()
         return
 
+    # Keep the id index in step with the list (e.g. for libraries built
+    # before the index existed)
+    if len(st.session_state.get("documents_by_id", {})) != len(documents):
+        st.session_state.documents_by_id = {doc["id"]: doc for doc in documents}
+
     # Library statistics
     show_library_stats(documents)
 
@@ -57,19 +65,26 @@ def show_empty_library():
     show_sample_documents_section()
 
 
+@st.cache_data(ttl=600, max_entries=64, show_spinner=False)
+def _docs_frame(doc_ids: tuple, _documents: List[Dict]) -> pd.DataFrame:
+    """Build a DataFrame of the library entries, one row per document."""
+    df = pd.DataFrame(
+        _documents,
+        columns=["id", "filename", "document_type", "risk_score", "file_size"],
+    )
+    return df.fillna(
+        {"filename": "", "document_type": "other", "risk_score": 0, "file_size": 0}
+    )
+
+
 def show_library_stats(documents: List[Dict]):
     """Display library statistics."""
-    # Calculate stats
-    total_docs = len(documents)
-    doc_types = {}
-    high_risk_docs = 0
+    df = _docs_frame(tuple(doc["id"] for doc in documents), documents)
 
-    for doc in documents:
-        doc_type = doc.get("document_type", "other")
-        doc_types[doc_type] = doc_types.get(doc_type, 0) + 1
-
-        if doc.get("risk_score", 0) > 60:
-            high_risk_docs += 1
+    # Calculate stats
+    total_docs = len(df)
+    doc_types = df["document_type"].value_counts(sort=False)
+    high_risk_docs = int((df["risk_score"] > 60).sum())
 
     # Display stats
     col1, col2, col3, col4 = st.columns(4)
@@ -78,7 +93,7 @@ def show_library_stats(documents: List[Dict]):
         st.metric(label="Total Documents", value=total_docs)
 
     with col2:
-        most_common_type = max(doc_types, key=doc_types.get) if doc_types else "None"
+        most_common_type = doc_types.idxmax() if not doc_types.empty else "None"
         st.metric(label="Most Common Type", value=most_common_type.title())
 
     with col3:
@@ -93,21 +108,22 @@ def show_library_stats(documents: List[Dict]):
         )
 
     with col4:
-        total_size = sum(doc.get("file_size", 0) for doc in documents)
+        total_size = int(df["file_size"].sum())
         st.metric(label="Total Storage", value=format_file_size(total_size))
 
 
 def show_library_filters(documents: List[Dict]):
     """Display filter and search options."""
+    doc_ids = tuple(doc["id"] for doc in documents)
+    df = _docs_frame(doc_ids, documents)
+
     st.markdown("---")
 
     col1, col2, col3 = st.columns(3)
 
     with col1:
         # Document type filter
-        doc_types = ["All"] + list(
-            set(doc.get("document_type", "other") for doc in documents)
-        )
+        doc_types = ["All"] + df["document_type"].unique().tolist()
         selected_type = st.selectbox("Filter by Type", doc_types)
 
     with col2:
@@ -126,41 +142,56 @@ def show_library_filters(documents: List[Dict]):
             "Search documents", placeholder="Enter filename or content..."
         )
 
-    # Apply filters
-    filtered_docs = documents
+    # Apply filters (cached on the library contents and filter values, so
+    # reruns triggered by other widgets skip the scans)
+    filtered_ids = _apply_filters(
+        doc_ids, documents, selected_type, selected_risk, search_term.lower()
+    )
+    docs_by_id = st.session_state.documents_by_id
+    filtered_docs = [docs_by_id[doc_id] for doc_id in filtered_ids]
+
+    # Store filtered docs for grid display
+    st.session_state.filtered_documents = filtered_docs
+
+
+@st.cache_data(ttl=600, max_entries=256, show_spinner=False)
+def _apply_filters(
+    doc_ids: tuple,
+    _documents: List[Dict],
+    selected_type: str,
+    selected_risk: str,
+    search_lower: str,
+) -> List[str]:
+    """Return the ids of library entries matching the type, risk and search filters.
+
+    Library entries are never edited in place (uploads append, deletes
+    rebuild the list), so the tuple of ids identifies the contents and
+    _documents is left out of the cache key.
+    """
+    df = _docs_frame(doc_ids, _documents)
+
+    # One combined mask instead of a pass per filter
+    mask = pd.Series(True, index=df.index)
 
     if selected_type != "All":
-        filtered_docs = [
-            doc for doc in filtered_docs if doc.get("document_type") == selected_type
-        ]
+        mask &= df["document_type"].eq(selected_type)
 
     if selected_risk != "All":
         if "Low Risk" in selected_risk:
-            filtered_docs = [
-                doc for doc in filtered_docs if doc.get("risk_score", 0) <= 30
-            ]
+            mask &= df["risk_score"].le(30)
         elif "Medium Risk" in selected_risk:
-            filtered_docs = [
-                doc for doc in filtered_docs if 31 <= doc.get("risk_score", 0) <= 60
-            ]
+            mask &= df["risk_score"].between(31, 60)
         elif "High Risk" in selected_risk:
-            filtered_docs = [
-                doc for doc in filtered_docs if doc.get("risk_score", 0) > 60
-            ]
+            mask &= df["risk_score"].gt(60)
 
-    if search_term:
-        filtered_docs = [
-            doc
-            for doc in filtered_docs
-            if search_term.lower() in doc.get("filename", "").lower()
-        ]
+    if search_lower:
+        mask &= df["filename"].str.lower().str.contains(search_lower, regex=False)
 
-    # Store filtered docs for grid display
-    st.session_state.filtered_documents = filtered_docs
+    return df.loc[mask, "id"].tolist()
 
 
 def show_document_grid(documents: List[Dict]):
-    """Display documents in a grid layout."""
+    """Display documents as one selectable table with actions for the selected row."""
     filtered_docs = st.session_state.get("filtered_documents", documents)
 
     if not filtered_docs:
@@ -170,53 +201,67 @@ def show_document_grid(documents: List[Dict]):
     st.markdown("---")
     st.subheader(f"📄 Documents ({len(filtered_docs)})")
 
-    # Display documents in cards
-    for i in range(0, len(filtered_docs), 2):
-        col1, col2 = st.columns(2)
-
-        # First document
-        with col1:
-            if i < len(filtered_docs):
-                show_document_card(filtered_docs[i])
-
-        # Second document
-        with col2:
-            if i + 1 < len(filtered_docs):
-                show_document_card(filtered_docs[i + 1])
-
-
-def show_document_card(doc: Dict):
-    """Display a single document card."""
-    # Risk color
-    risk_score = doc.get("risk_score", 0)
-    if risk_score > 60:
-        risk_color = "🔴"
-        risk_label = "High Risk"
-    elif risk_score > 30:
-        risk_color = "🟠"
-        risk_label = "Medium Risk"
-    else:
-        risk_color = "🟢"
-        risk_label = "Low Risk"
+    _decorate(filtered_docs)
 
-    # Use container for card styling
-    with st.container():
-        # Header row with filename and risk
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.markdown(f"**📄 {doc.get('filename', 'Unknown')}**")
-        with col2:
-            st.markdown(f"{risk_color} {risk_label}")
+    table = pd.DataFrame(
+        [
+            {
+                "File": doc.get("filename", "Unknown"),
+                "Type": doc["_type_title"],
+                "Risk": f"{doc['_risk_color']} {doc['_risk_label']}",
+                "Uploaded": doc.get("upload_date", "Unknown"),
+                "Size": doc["_size_str"],
+                "id": doc["id"],
+            }
+            for doc in filtered_docs
+        ]
+    )
+    event = st.dataframe(
+        table,
+        hide_index=True,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        column_config={"id": None},
+        # The selection is a row position, so key the table on the rows it
+        # shows: changing the filters, search or library starts a fresh
+        # selection instead of pointing at whichever document moved there
+        key=f"library_table_{hash(tuple(table['id']))}",
+    )
+
+    rows = event.selection.rows
+    if not rows:
+        st.caption("Select a document to view it, ask questions or delete it.")
+        return
+
+    show_document_actions(filtered_docs[rows[0]])
+
+
+# (emoji, label) per risk bucket: <=30, 31-60, 61+
+_RISK_BADGES = (("🟢", "Low Risk"), ("🟠", "Medium Risk"), ("🔴", "High Risk"))
+
+
+def _decorate(docs: List[Dict]):
+    """Compute library entries' display fields once and keep them on the dicts."""
+    pending = [doc for doc in docs if "_size_str" not in doc]
+    if not pending:
+        return
+
+    # Bucket all risk scores in one vectorised call
+    risk_scores = np.fromiter(
+        (doc.get("risk_score", 0) for doc in pending), dtype=float, count=len(pending)
+    )
+    buckets = np.digitize(risk_scores, [30, 60], right=True)
 
-        # Document details
-        doc_type = doc.get("document_type", "other").title()
-        upload_date = doc.get("upload_date", "Unknown")
-        file_size = format_file_size(doc.get("file_size", 0))
+    for doc, bucket in zip(pending, buckets):
+        doc["_risk_color"], doc["_risk_label"] = _RISK_BADGES[bucket]
+        doc["_type_title"] = doc.get("document_type", "other").title()
+        doc["_size_str"] = format_file_size(doc.get("file_size", 0))
 
-        st.markdown(f"📋 {doc_type} • 📅 {upload_date} • 💾 {file_size}")
 
-        # Add some spacing
-        st.markdown("---")
+def show_document_actions(doc: Dict):
+    """Display the action buttons for the selected document."""
+    st.markdown(f"**📄 {doc.get('filename', 'Unknown')}**")
 
     # Action buttons
     col1, col2, col3 = st.columns(3)
@@ -234,45 +279,58 @@ def show_document_card(doc: Dict):
             delete_document(doc["id"])
 
 
+def _find_library_entry(doc_id: str) -> Optional[Dict]:
+    """Look up a library entry by id, falling back to a scan if it isn't indexed."""
+    doc = st.session_state.get("documents_by_id", {}).get(doc_id)
+    if doc is None:
+        doc = next(
+            (
+                d
+                for d in st.session_state.get("documents_library", [])
+                if d["id"] == doc_id
+            ),
+            None,
+        )
+    return doc
+
+
 def load_document_for_analysis(doc_id: str):
     """Load a document from library for analysis."""
-    documents = st.session_state.get("documents_library", [])
+    doc = _find_library_entry(doc_id)
+    if doc is None:
+        return
 
-    for doc in documents:
-        if doc["id"] == doc_id:
-            # Simulate loading the full document data
-            st.session_state.current_document = {
-                "id": doc["id"],
-                "filename": doc["filename"],
-                "document_type": doc["document_type"],
-                "original_text": f"Sample content for {doc['filename']}...",  # In real app, load from storage
-                "is_sample": True,  # Mark as sample for demo
-                "risk_score": doc.get("risk_score", 0),
-            }
+    # Prefer the full analysed document; otherwise simulate loading it
+    set_current_document(document_store().get(doc_id) or {
+        "id": doc["id"],
+        "filename": doc["filename"],
+        "document_type": doc["document_type"],
+        "original_text": f"Sample content for {doc['filename']}...",  # In real app, load from storage
+        "is_sample": True,  # Mark as sample for demo
+        "risk_score": doc.get("risk_score", 0),
+    })
 
-            st.session_state.page = "📊 Analysis"
-            st.rerun()
-            break
+    st.session_state.page = "📊 Analysis"
+    st.rerun()
 
 
 def load_document_for_qa(doc_id: str):
     """Load a document from library for Q&A."""
-    documents = st.session_state.get("documents_library", [])
+    doc = _find_library_entry(doc_id)
+    if doc is None:
+        return
 
-    for doc in documents:
-        if doc["id"] == doc_id:
-            # Simulate loading the full document data
-            st.session_state.current_document = {
-                "id": doc["id"],
-                "filename": doc["filename"],
-                "document_type": doc["document_type"],
-                "original_text": f"Sample content for {doc['filename']}...",  # In real app, load from storage
-                "is_sample": True,  # Mark as sample for demo
-            }
+    # Prefer the full analysed document; otherwise simulate loading it
+    set_current_document(document_store().get(doc_id) or {
+        "id": doc["id"],
+        "filename": doc["filename"],
+        "document_type": doc["document_type"],
+        "original_text": f"Sample content for {doc['filename']}...",  # In real app, load from storage
+        "is_sample": True,  # Mark as sample for demo
+    })
 
-            st.session_state.page = "💬 Q&A"
-            st.rerun()
-            break
+    st.session_state.page = "💬 Q&A"
+    st.rerun()
 
 
 def delete_document(doc_id: str):
@@ -283,6 +341,8 @@ def delete_document(doc_id: str):
         st.session_state.documents_library = [
             doc for doc in documents if doc["id"] != doc_id
         ]
+        st.session_state.get("documents_by_id", {}).pop(doc_id, None)
+        document_store().pop(doc_id, None)
 
         # Clear confirmation state
         del st.session_state[f"confirm_delete_{doc_id}"]
@@ -292,18 +352,11 @@ def delete_document(doc_id: str):
 
 def show_sample_documents_section():
     """Show available sample documents for testing."""
-    import os
-
     st.subheader("🎯 Try Sample Documents")
     st.markdown("Get started by analyzing our sample legal documents:")
 
     # Get available sample documents
-    sample_dir = "./sample"
-    sample_files = []
-    if os.path.exists(sample_dir):
-        sample_files = [
-            f for f in os.listdir(sample_dir) if f.endswith((".pdf", ".docx", ".txt"))
-        ]
+    sample_files = list_sample_files()
 
     if sample_files:
         # Create description mapping for better UX
@@ -314,10 +367,8 @@ def show_sample_documents_section():
             "Residential_Lease_Agreement.pdf": "🏠 Check rental terms, deposits, and tenant rights",
         }
 
-        for filename in sample_files:
-            with st.expander(
-                f"📄 {filename.replace('_', ' ').replace('.pdf', '')}", expanded=False
-            ):
+        for filename, display_name in sample_files:
+            with st.expander(f"📄 {display_name}", expanded=False):
                 col1, col2 = st.columns([2, 1])
 
                 with col1:
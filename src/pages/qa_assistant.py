@@ -1,23 +1,27 @@
 import streamlit as st
-from typing import List, Dict
+from typing import Dict, Tuple
+import hashlib
 import time
+from pathlib import Path
 
-from ..services.ai_analyzer import AIAnalyzer
-from ..services.vector_store import VectorStoreService
+from ..models.document import DocumentType, get_current_document
+from ..services.ai_analyzer import QA_FALLBACK_ANSWER, get_ai_analyzer
+
+# Number of most recent Q&A turns shown as individual chat messages
+_LIVE_TURNS = 20
 
 
 def show_qa_interface():
     """Display the Q&A assistant interface."""
 
-    if not st.session_state.get("current_document"):
+    doc = get_current_document()
+    if not doc:
         st.warning("⚠️ No document loaded. Please upload and analyze a document first.")
         if st.button("📄 Go to Upload"):
             st.session_state.page = "📄 Upload"
             st.rerun()
         return
 
-    doc = st.session_state.current_document
-
     # Header
     st.header("💬 Q&A Assistant")
     st.markdown(f"Ask questions about **{doc.get('filename', 'your document')}**")
@@ -26,12 +30,33 @@ def show_qa_interface():
     if "qa_history" not in st.session_state:
         st.session_state.qa_history = []
 
+    # Questions queued by the suggestion buttons or the form are answered
+    # here, in one place, before anything else is drawn
+    pending_question = st.session_state.pop("pending_question", None)
+    if pending_question:
+        ask_question(pending_question, doc)
+
     # Chat interface
     chat_container = st.container()
 
     with chat_container:
-        # Display chat history
-        for i, qa in enumerate(st.session_state.qa_history):
+        history = st.session_state.qa_history
+
+        # Older turns are collapsed into one markdown block, built
+        # incrementally as the history grows
+        render_cache = st.session_state.setdefault("qa_render_cache", [])
+        if len(render_cache) > len(history):
+            render_cache.clear()
+        for qa in history[len(render_cache) :]:
+            render_cache.append(f"**You:** {qa['question']}\n\n{qa['answer']}")
+
+        earlier = render_cache[:-_LIVE_TURNS]
+        if earlier:
+            with st.expander(f"Earlier conversation ({len(earlier)} questions)"):
+                st.markdown("\n\n---\n\n".join(earlier))
+
+        # Display the most recent turns as chat messages
+        for qa in history[-_LIVE_TURNS:]:
             # User message
             with st.chat_message("user"):
                 st.markdown(qa["question"])
@@ -51,23 +76,28 @@ def show_qa_interface():
     for i, question in enumerate(suggested_questions):
         col = col1 if i % 2 == 0 else col2
         with col:
-            if st.button(question, key=f"suggested_{i}", use_container_width=True):
-                ask_question(question, doc)
+            st.button(
+                question,
+                key=f"suggested_{i}",
+                use_container_width=True,
+                on_click=_queue_question,
+                args=(question,),
+            )
 
     # Chat input
     st.markdown("### ❓ Ask Your Question")
 
     with st.form("question_form", clear_on_submit=True):
-        user_question = st.text_input(
+        st.text_input(
             "Type your question here...",
             placeholder="e.g., What happens if I terminate this contract early?",
             label_visibility="collapsed",
+            key="qa_question_input",
         )
 
-        submitted = st.form_submit_button("Send", use_container_width=True)
-
-        if submitted and user_question.strip():
-            ask_question(user_question, doc)
+        st.form_submit_button(
+            "Send", use_container_width=True, on_click=_queue_form_question
+        )
 
     # Quick actions
     st.markdown("---")
@@ -81,6 +111,7 @@ def show_qa_interface():
     with col2:
         if st.button("🗑️ Clear Chat", use_container_width=True):
             st.session_state.qa_history = []
+            st.session_state.qa_render_cache = []
             st.rerun()
 
     with col3:
@@ -88,101 +119,135 @@ def show_qa_interface():
             export_chat_history()
 
 
+def _queue_question(question: str):
+    """Button callback: queue a question for show_qa_interface to answer."""
+    st.session_state.pending_question = question
+
+
+def _queue_form_question():
+    """Form callback: queue the typed question, if any."""
+    question = st.session_state.get("qa_question_input", "").strip()
+    if question:
+        st.session_state.pending_question = question
+
+
+class _AnswerUnavailable(Exception):
+    """Raised inside _cached_answer so failed model calls are not cached."""
+
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_answer(
+    doc_hash: str, doc_type: str, question_norm: str, _question: str, _text: str
+) -> str:
+    """Answer a question, cached on the document hash and normalised question."""
+    answer = get_ai_analyzer().answer_question(
+        question=_question,
+        document_text=_text,
+        document_type=DocumentType(doc_type),
+    )
+    if answer == QA_FALLBACK_ANSWER:
+        raise _AnswerUnavailable
+    return answer
+
+
 def ask_question(question: str, doc: Dict):
     """Process a question and get AI response."""
     try:
         # Show thinking indicator
         with st.spinner("🤔 Thinking..."):
-            # Initialize AI analyzer
-            ai_analyzer = AIAnalyzer()
-
-            # Get document type
-            from ..models.document import DocumentType
-
-            doc_type = DocumentType(doc.get("document_type", "other"))
-
-            # Get answer from AI
-            answer = ai_analyzer.answer_question(
-                question=question,
-                document_text=doc.get("original_text", ""),
-                document_type=doc_type,
-            )
+            # Hash the document text once; cached answers are keyed on it
+            if "hash" not in doc:
+                doc["hash"] = hashlib.blake2b(
+                    doc.get("original_text", "").encode(), digest_size=16
+                ).hexdigest()
+
+            # Get answer from AI (repeat questions on the same document are
+            # served from the cache)
+            try:
+                answer = _cached_answer(
+                    doc["hash"],
+                    doc.get("document_type", "other"),
+                    " ".join(question.lower().split()),
+                    question,
+                    doc.get("original_text", ""),
+                )
+            except _AnswerUnavailable:
+                answer = QA_FALLBACK_ANSWER
 
             # Add to chat history
+            # No rerun needed: questions are answered before the chat
+            # history is drawn, so the new turn shows up in this run
             st.session_state.qa_history.append(
                 {"question": question, "answer": answer, "timestamp": time.time()}
             )
 
-            # Rerun to show the new Q&A
-            st.rerun()
-
     except Exception as e:
         st.error(f"❌ Error processing question: {str(e)}")
 
 
-def get_suggested_questions(doc_type: str) -> List[str]:
+# Suggested questions per document type
+_QUESTIONS_BY_TYPE: Dict[str, Tuple[str, ...]] = {
+    "rental": (
+        "What is the monthly rent amount?",
+        "What happens if I pay rent late?",
+        "How much is the security deposit?",
+        "Can I terminate the lease early?",
+        "Who is responsible for repairs?",
+        "What are the landlord's obligations?",
+        "Are pets allowed in the property?",
+        "What happens if I damage the property?",
+    ),
+    "loan": (
+        "What is the total amount I will repay?",
+        "What is the effective interest rate?",
+        "What happens if I miss a payment?",
+        "What collateral is required?",
+        "Can I repay the loan early?",
+        "What are the processing fees?",
+        "How is the interest calculated?",
+        "What happens in case of default?",
+    ),
+    "employment": (
+        "What is my total compensation package?",
+        "How many hours am I expected to work?",
+        "Can the company terminate me without notice?",
+        "What are the non-compete restrictions?",
+        "Am I allowed to work other jobs?",
+        "What benefits am I entitled to?",
+        "How much notice must I give to resign?",
+        "Who owns the intellectual property I create?",
+    ),
+    "nda": (
+        "What information is considered confidential?",
+        "How long does the confidentiality last?",
+        "What are the penalties for disclosure?",
+        "Can I discuss this agreement with others?",
+        "What happens after the agreement ends?",
+        "Are there any exceptions to confidentiality?",
+    ),
+    "service": (
+        "What services are included in this agreement?",
+        "What is the payment schedule?",
+        "How can this agreement be terminated?",
+        "What are the deliverables and deadlines?",
+        "Who is responsible for what costs?",
+        "What happens if the work is unsatisfactory?",
+    ),
+}
+
+_DEFAULT_QUESTIONS: Tuple[str, ...] = (
+    "What are the main obligations for each party?",
+    "What are the key financial terms?",
+    "How can this agreement be terminated?",
+    "What are the potential risks for me?",
+    "What should I be most careful about?",
+    "Are there any unusual or concerning clauses?",
+)
+
+
+def get_suggested_questions(doc_type: str) -> Tuple[str, ...]:
     """Get suggested questions based on document type."""
-
-    questions_by_type = {
-        "rental": [
-            "What is the monthly rent amount?",
-            "What happens if I pay rent late?",
-            "How much is the security deposit?",
-            "Can I terminate the lease early?",
-            "Who is responsible for repairs?",
-            "What are the landlord's obligations?",
-            "Are pets allowed in the property?",
-            "What happens if I damage the property?",
-        ],
-        "loan": [
-            "What is the total amount I will repay?",
-            "What is the effective interest rate?",
-            "What happens if I miss a payment?",
-            "What collateral is required?",
-            "Can I repay the loan early?",
-            "What are the processing fees?",
-            "How is the interest calculated?",
-            "What happens in case of default?",
-        ],
-        "employment": [
-            "What is my total compensation package?",
-            "How many hours am I expected to work?",
-            "Can the company terminate me without notice?",
-            "What are the non-compete restrictions?",
-            "Am I allowed to work other jobs?",
-            "What benefits am I entitled to?",
-            "How much notice must I give to resign?",
-            "Who owns the intellectual property I create?",
-        ],
-        "nda": [
-            "What information is considered confidential?",
-            "How long does the confidentiality last?",
-            "What are the penalties for disclosure?",
-            "Can I discuss this agreement with others?",
-            "What happens after the agreement ends?",
-            "Are there any exceptions to confidentiality?",
-        ],
-        "service": [
-            "What services are included in this agreement?",
-            "What is the payment schedule?",
-            "How can this agreement be terminated?",
-            "What are the deliverables and deadlines?",
-            "Who is responsible for what costs?",
-            "What happens if the work is unsatisfactory?",
-        ],
-    }
-
-    return questions_by_type.get(
-        doc_type,
-        [
-            "What are the main obligations for each party?",
-            "What are the key financial terms?",
-            "How can this agreement be terminated?",
-            "What are the potential risks for me?",
-            "What should I be most careful about?",
-            "Are there any unusual or concerning clauses?",
-        ],
-    )
+    return _QUESTIONS_BY_TYPE.get(doc_type, _DEFAULT_QUESTIONS)
 
 
 def export_chat_history():
@@ -191,10 +256,11 @@ def export_chat_history():
         st.warning("No chat history to export.")
         return
 
-    doc = st.session_state.current_document
+    doc = get_current_document() or {}
 
     # Create chat export
-    export_text = f"""
+    parts = [
+        f"""
 LEGA.AI Q&A SESSION EXPORT
 {'='*50}
 
@@ -206,9 +272,11 @@ QUESTIONS & ANSWERS:
 {'='*50}
 
 """
+    ]
 
     for i, qa in enumerate(st.session_state.qa_history):
-        export_text += f"""
+        parts.append(
+            f"""
 Q{i+1}: {qa['question']}
 
 A{i+1}: {qa['answer']}
@@ -216,24 +284,20 @@ A{i+1}: {qa['answer']}
 {'-'*30}
 
 """
+        )
 
-    export_text += "\nGenerated by Lega.AI - Making legal documents accessible"
+    parts.append("\nGenerated by Lega.AI - Making legal documents accessible")
+    export_text = "".join(parts)
 
-    # Clean filename - remove .pdf extension if present
-    filename = doc.get("filename", "document")
-    if filename.endswith(".pdf"):
-        filename = filename[:-4]
-    if filename.endswith(".docx"):
-        filename = filename[:-5]
-    if filename.endswith(".txt"):
-        filename = filename[:-4]
+    # Clean filename - drop the extension
+    filename = Path(doc.get("filename", "document")).stem
 
     # Offer download
     st.download_button(
         label="📥 Download Chat History",
         data=export_text,
-        file_name=f"lega_ai_qa_{filename}.pdf",
-        mime="application/pdf",
+        file_name=f"lega_ai_qa_{filename}.txt",
+        mime="text/plain",
     )
 
     st.success("✅ Chat history prepared for download!")
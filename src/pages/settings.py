@@ -31,9 +31,7 @@ def show_api_settings():
     st.subheader("🔑 API Configuration")
 
     # Check current API key status
-    api_key_configured = bool(
-        config.GOOGLE_API_KEY and config.GOOGLE_API_KEY != "your-google-api-key-here"
-    )
+    api_key_configured = config.get_config_summary()["api_configured"]
 
     if api_key_configured:
         st.success("✅ Google AI API key is configured")
@@ -75,97 +73,112 @@ def show_api_settings():
                 st.error("❌ Please enter a valid API key")
 
 
+@st.fragment
 def show_preference_settings():
     """Display user preference settings."""
     st.subheader("🎨 User Preferences")
 
-    # Language settings
-    st.markdown("#### 🌐 Language & Region")
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        language = st.selectbox(
-            "Interface Language",
-            ["English", "Hindi", "Tamil", "Telugu", "Gujarati"],
-            help="Language for the user interface",
+    # Widgets inside the form only send their values on submit
+    with st.form("preferences_form", border=False):
+        # Language settings
+        st.markdown("#### 🌐 Language & Region")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            language = st.selectbox(
+                "Interface Language",
+                ["English", "Hindi", "Tamil", "Telugu", "Gujarati"],
+                help="Language for the user interface",
+            )
+
+        with col2:
+            region = st.selectbox(
+                "Legal Region",
+                ["India", "Maharashtra", "Delhi", "Karnataka", "Tamil Nadu"],
+                help="Legal jurisdiction for document analysis",
+            )
+
+        # Analysis preferences
+        st.markdown("#### 📊 Analysis Preferences")
+
+        risk_sensitivity = st.slider(
+            "Risk Detection Sensitivity",
+            min_value=1,
+            max_value=5,
+            value=3,
+            help="1 = Only critical risks, 5 = All potential concerns",
         )
 
-    with col2:
-        region = st.selectbox(
-            "Legal Region",
-            ["India", "Maharashtra", "Delhi", "Karnataka", "Tamil Nadu"],
-            help="Legal jurisdiction for document analysis",
+        simplification_level = st.selectbox(
+            "Text Simplification Level",
+            ["Basic", "Intermediate", "Advanced"],
+            index=1,
+            help="How much to simplify legal language",
         )
 
-    # Analysis preferences
-    st.markdown("#### 📊 Analysis Preferences")
-
-    risk_sensitivity = st.slider(
-        "Risk Detection Sensitivity",
-        min_value=1,
-        max_value=5,
-        value=3,
-        help="1 = Only critical risks, 5 = All potential concerns",
-    )
+        show_suggestions = st.checkbox(
+            "Show improvement suggestions",
+            value=True,
+            help="Display suggestions for problematic clauses",
+        )
 
-    simplification_level = st.selectbox(
-        "Text Simplification Level",
-        ["Basic", "Intermediate", "Advanced"],
-        index=1,
-        help="How much to simplify legal language",
-    )
+        # Notification preferences
+        st.markdown("#### 🔔 Notifications")
 
-    show_suggestions = st.checkbox(
-        "Show improvement suggestions",
-        value=True,
-        help="Display suggestions for problematic clauses",
-    )
+        email_notifications = st.checkbox(
+            "Email notifications for analysis completion", value=False
+        )
 
-    # Notification preferences
-    st.markdown("#### 🔔 Notifications")
+        browser_notifications = st.checkbox("Browser notifications", value=True)
 
-    email_notifications = st.checkbox(
-        "Email notifications for analysis completion", value=False
-    )
+        # Save preferences
+        if st.form_submit_button("💾 Save Preferences", type="primary"):
+            # In a real app, save to user profile/database
+            st.success("✅ Preferences saved successfully!")
 
-    browser_notifications = st.checkbox("Browser notifications", value=True)
 
-    # Save preferences
-    if st.button("💾 Save Preferences", type="primary"):
-        # In a real app, save to user profile/database
-        st.success("✅ Preferences saved successfully!")
+@st.cache_data(show_spinner=False)
+def _compute_usage_stats() -> dict:
+    """Build the (mock) usage metrics and per-type progress values."""
+    usage_data = {
+        "Rental Agreements": 18,
+        "Loan Contracts": 12,
+        "Employment Contracts": 8,
+        "Service Agreements": 6,
+        "NDAs": 3,
+    }
+    max_count = max(usage_data.values())
+
+    return {
+        "metrics": [
+            {"label": "Documents Analyzed", "value": "47", "delta": "12 this month"},
+            {"label": "Questions Asked", "value": "156", "delta": "23 this week"},
+            {"label": "Risks Identified", "value": "89", "delta": "High: 12, Medium: 31"},
+        ],
+        "usage_by_type": [
+            (doc_type, count, count / max_count)
+            for doc_type, count in usage_data.items()
+        ],
+    }
 
 
+@st.fragment
 def show_usage_stats():
     """Display usage statistics."""
     st.subheader("📊 Usage Statistics")
 
-    # Mock usage data
-    col1, col2, col3 = st.columns(3)
+    stats = _compute_usage_stats()
 
-    with col1:
-        st.metric(label="Documents Analyzed", value="47", delta="12 this month")
-
-    with col2:
-        st.metric(label="Questions Asked", value="156", delta="23 this week")
-
-    with col3:
-        st.metric(label="Risks Identified", value="89", delta="High: 12, Medium: 31")
+    # Mock usage data
+    for col, metric in zip(st.columns(3), stats["metrics"]):
+        with col:
+            st.metric(**metric)
 
     # Usage by document type
     st.markdown("#### 📄 Analysis by Document Type")
 
-    usage_data = {
-        "Rental Agreements": 18,
-        "Loan Contracts": 12,
-        "Employment Contracts": 8,
-        "Service Agreements": 6,
-        "NDAs": 3,
-    }
-
-    for doc_type, count in usage_data.items():
-        progress = count / max(usage_data.values())
+    for doc_type, count, progress in stats["usage_by_type"]:
         st.markdown(f"**{doc_type}**: {count} documents")
         st.progress(progress)
 
@@ -210,6 +223,7 @@ def show_usage_stats():
             st.info("Upgrade functionality would be implemented here")
 
 
+@st.fragment
 def show_about_info():
     """Display about information."""
     st.subheader("ℹ️ About Lega.AI")
@@ -1,14 +1,27 @@
 import streamlit as st
-import os
-from typing import Optional
+import hashlib
+import io
+from typing import Any, Dict, Optional, Tuple
 import time
 
-from ..services.document_processor import DocumentProcessor
-from ..services.ai_analyzer import AIAnalyzer
-from ..services.vector_store import VectorStoreService
-from ..models.document import DocumentType
+# The services pull in LangChain, Gemini and Chroma, so they are imported
+# inside the functions that use them rather than when the page is opened
+from ..models.document import DocumentType, set_current_document
+from ..utils.config import config
 from ..utils.helpers import generate_document_id, sanitize_filename, format_file_size
 from ..utils.logger import log_document_upload
+from ..utils.samples import SAMPLE_DIR, list_sample_files
+
+
+
+
+class _SampleFile(io.BytesIO):
+    """In-memory stand-in for st.UploadedFile used by the sample documents."""
+
+    def __init__(self, content: bytes, name: str):
+        super().__init__(content)
+        self.name = name
+        self.size = len(content)
 
 
 def show_upload_interface():
@@ -18,10 +31,9 @@ def show_upload_interface():
         "Upload your legal document for instant AI analysis and risk assessment."
     )
 
-    # Check if we should auto-load a sample document
-    if st.session_state.get("load_sample"):
-        filename = st.session_state.load_sample
-        del st.session_state.load_sample  # Clear the flag
+    # Check if we should auto-load a sample document (popped so it fires once)
+    filename = st.session_state.pop("load_sample", None)
+    if filename:
         load_sample_document_from_file(filename)
         return
 
@@ -29,16 +41,15 @@ def show_upload_interface():
     uploaded_file = st.file_uploader(
         "Choose a file",
         type=["pdf", "txt", "docx"],  # Added docx support
-        help="Supported formats: PDF, TXT, DOCX (Max 10MB)",
+        help=f"Supported formats: PDF, TXT, DOCX (Max {config.MAX_FILE_SIZE_MB}MB)",
         key="document_uploader",
     )
 
     if uploaded_file is not None:
-        # Display file info
-        file_size = len(uploaded_file.getvalue())
-
-        # Check file size limit
-        max_size = 10 * 1024 * 1024  # 10MB
+        # Check file size limit; UploadedFile.size is known without reading
+        # the buffer, so oversized files are rejected before any copy is made
+        file_size = uploaded_file.size
+        max_size = config.MAX_FILE_SIZE_MB * 1024 * 1024
         if file_size > max_size:
             st.error(f"❌ File too large. Maximum size is {format_file_size(max_size)}")
             return
@@ -55,288 +66,194 @@ def show_upload_interface():
     st.markdown("Don't have a document handy? Try one of our real sample documents:")
 
     # Get available sample documents
-    sample_dir = "./sample"
-    sample_files = []
-    if os.path.exists(sample_dir):
-        sample_files = [f for f in os.listdir(sample_dir) if f.endswith(('.pdf', '.docx', '.txt'))]
+    sample_files = list_sample_files()
 
     if sample_files:
         col1, col2 = st.columns(2)
         
-        for i, filename in enumerate(sample_files):
+        for i, (filename, display_name) in enumerate(sample_files):
             col = col1 if i % 2 == 0 else col2
             
             with col:
-                # Create descriptive button names
-                display_name = filename.replace('_', ' ').replace('.pdf', '').replace('.docx', '').replace('.txt', '')
-                display_name = display_name.title()
-                
-                if st.button(f"📄 {display_name}", use_container_width=True, key=f"sample_{i}"):
-                    load_sample_document_from_file(filename)
+                st.button(
+                    f"📄 {display_name}",
+                    use_container_width=True,
+                    key=f"sample_{i}",
+                    on_click=_queue_sample,
+                    args=(filename,),
+                )
     else:
         st.info("No sample documents found in the sample directory.")
 
 
+def _queue_sample(filename: str):
+    """Button callback: load the sample at the top of the next run."""
+    st.session_state.load_sample = filename
+
+
 def process_uploaded_document(uploaded_file):
     """Process the uploaded document with AI analysis."""
     try:
-        # Initialize processors
-        doc_processor = DocumentProcessor()
-        ai_analyzer = AIAnalyzer()
-        vector_store = VectorStoreService()
-
-        # Create progress tracking
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-
-        # Step 1: Extract text
-        status_text.text("📄 Extracting text from document...")
-        progress_bar.progress(20)
-
-        file_content = uploaded_file.getvalue()
-        text = doc_processor.extract_text(file_content, uploaded_file.name)
-
-        if not text.strip():
-            st.error(
-                "❌ Could not extract text from the document. Please try a different file."
+        # Shared processors (created once per server, see st.cache_resource)
+        from ..services.document_processor import get_doc_processor
+        from ..services.vector_store import get_vector_store
+
+        doc_processor = get_doc_processor()
+        vector_store = get_vector_store()
+
+        with st.status("🤖 Analyzing document...", expanded=True) as status:
+            # Step 1: Extract text
+            st.write("📄 Extracting text from document...")
+            file_size = uploaded_file.size
+            file_content = uploaded_file.getvalue()
+            file_hash = hashlib.blake2b(file_content, digest_size=16).hexdigest()
+            text = _extract_text_cached(file_hash, uploaded_file.name, file_content)
+
+            if not text.strip():
+                status.update(label="❌ Text extraction failed", state="error")
+                st.error(
+                    "❌ Could not extract text from the document. Please try a different file."
+                )
+                return
+
+            # Step 2: Detect document type
+            st.write("🔍 Analyzing document type...")
+            document_type = doc_processor.detect_document_type(text)
+
+            # Steps 3-5: Risk analysis, simplification and summary run
+            # concurrently in the analyzer. Results are cached on the text
+            # hash, so re-analysing a document is instant.
+            st.write(
+                "⚠️ Assessing risks, simplifying language and generating summary..."
+            )
+            text_hash = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+            try:
+                risk_data, simplified_data, summary = _cached_analysis(
+                    text_hash, document_type.value, text
+                )
+            except _AnalysisUnavailable as e:
+                risk_data, simplified_data, summary = e.fallback
+
+            # Step 6: Add to vector store
+            st.write("💾 Storing document for search...")
+            doc_id = generate_document_id()
+            upload_date = time.strftime("%Y-%m-%d %H:%M:%S")
+            vector_store.add_document(
+                document_id=doc_id,
+                chunks=doc_processor.split_text_into_chunks(text),
+                metadata={
+                    "filename": uploaded_file.name,
+                    "document_type": document_type.value,
+                    "upload_date": upload_date,
+                },
             )
-            progress_bar.empty()
-            status_text.empty()
-            return
-
-        progress_bar.progress(40)
-
-        # Step 2: Detect document type
-        status_text.text("🔍 Analyzing document type...")
-        document_type = doc_processor.detect_document_type(text)
-        progress_bar.progress(50)
-
-        # Step 3: Risk analysis
-        status_text.text("⚠️ Performing risk assessment...")
-        risk_data = ai_analyzer.analyze_document_risk(text, document_type)
-        progress_bar.progress(70)
-
-        # Step 4: Text simplification
-        status_text.text("💬 Simplifying legal language...")
-        simplified_data = ai_analyzer.simplify_text(text, document_type)
-        progress_bar.progress(85)
-
-        # Step 5: Generate summary
-        status_text.text("📋 Generating summary...")
-        summary = ai_analyzer.generate_summary(text, document_type)
-
-        # Step 6: Add to vector store
-        status_text.text("💾 Storing document for search...")
-        doc_id = generate_document_id()
-        vector_store.add_document(
-            document_id=doc_id,
-            text=text,
-            metadata={
-                "filename": uploaded_file.name,
-                "document_type": document_type.value,
-                "upload_date": time.strftime("%Y-%m-%d %H:%M:%S"),
-            },
-        )
-
-        progress_bar.progress(100)
 
-        # Complete
-        status_text.text("✅ Analysis complete!")
-        time.sleep(1)
-        progress_bar.empty()
-        status_text.empty()
+            # Complete
+            status.update(label="✅ Analysis complete!", state="complete")
 
-        # Store results in session state
-        st.session_state.current_document = {
+        # Store results; the session only keeps a reference to them
+        set_current_document({
             "id": doc_id,
             "filename": uploaded_file.name,
             "document_type": document_type.value,
             "original_text": text,
+            "hash": text_hash,
             "simplified_text": simplified_data.get("simplified_text", ""),
             "summary": summary,
             "risk_data": risk_data,
             "key_points": simplified_data.get("key_points", []),
             "jargon_definitions": simplified_data.get("jargon_definitions", {}),
             "analysis_timestamp": time.time(),
-            "file_size": len(file_content),
-        }
+            "file_size": file_size,
+        })
 
-        # Add to documents library
-        if "documents_library" not in st.session_state:
-            st.session_state.documents_library = []
-
-        st.session_state.documents_library.append(
-            {
-                "id": doc_id,
-                "filename": uploaded_file.name,
-                "document_type": document_type.value,
-                "upload_date": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "file_size": len(file_content),
-                "risk_score": len(risk_data.get("risk_factors", []))
-                * 10,  # Simple risk score
-            }
-        )
+        # Add to documents library (list for display order, dict for lookups)
+        risk_score = len(risk_data.get("risk_factors", [])) * 10  # Simple risk score
+        library_entry = {
+            "id": doc_id,
+            "filename": uploaded_file.name,
+            "document_type": document_type.value,
+            "upload_date": upload_date,
+            "file_size": file_size,
+            "risk_score": risk_score,
+        }
+        st.session_state.setdefault("documents_library", []).append(library_entry)
+        st.session_state.setdefault("documents_by_id", {})[doc_id] = library_entry
 
         # Log the upload
-        log_document_upload(uploaded_file.name, len(file_content))
+        log_document_upload(uploaded_file.name, file_size)
 
-        # Show success and redirect to analysis page
-        st.success("🎉 Document analysis completed! Redirecting to results...")
+        # Show success and redirect to analysis page; the toast outlives
+        # the rerun, so there is no need to hold the script thread here
+        st.toast("🎉 Document analysis completed!", icon="✅")
 
         # Set page state for redirection
         st.session_state.page = "📊 Analysis"
-
-        time.sleep(2)
         st.rerun()
 
     except Exception as e:
         st.error(f"❌ Error processing document: {str(e)}")
-        progress_bar.empty()
-        status_text.empty()
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _extract_text_cached(file_hash: str, filename: str, _content: bytes) -> str:
+    """Extract text once per distinct file, keyed on the content hash."""
+    from ..services.document_processor import get_doc_processor
+
+    return get_doc_processor().extract_text(io.BytesIO(_content), filename)
+
+
+class _AnalysisUnavailable(Exception):
+    """Raised inside _cached_analysis so fallback results are not cached."""
+
+    def __init__(self, fallback: Tuple[Dict[str, Any], Dict[str, Any], str]):
+        super().__init__()
+        self.fallback = fallback
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _cached_analysis(
+    text_hash: str, doc_type: str, _text: str
+) -> Tuple[Dict[str, Any], Dict[str, Any], str]:
+    """Risk analysis, simplification and summary, cached on the text hash."""
+    from ..services.ai_analyzer import (
+        RISK_EXTRACT_FAILED_ASSESSMENT,
+        RISK_FALLBACK_ASSESSMENT,
+        RISK_UNPARSED_ASSESSMENT,
+        SIMPLIFY_FALLBACK_POINT,
+        SIMPLIFY_UNPARSED_POINT,
+        SUMMARY_FALLBACK,
+        get_ai_analyzer,
+    )
+
+    results = get_ai_analyzer().analyze_all(_text, DocumentType(doc_type))
+    risk_data, simplified_data, summary = results
+    if (
+        risk_data.get("overall_assessment")
+        in (
+            RISK_FALLBACK_ASSESSMENT,
+            RISK_UNPARSED_ASSESSMENT,
+            RISK_EXTRACT_FAILED_ASSESSMENT,
+        )
+        or simplified_data.get("key_points")
+        in ([SIMPLIFY_FALLBACK_POINT], [SIMPLIFY_UNPARSED_POINT])
+        or summary == SUMMARY_FALLBACK
+    ):
+        raise _AnalysisUnavailable(results)
+    return results
 
 
 def load_sample_document_from_file(filename: str):
     """Load an actual sample document from the sample directory."""
     try:
-        sample_path = os.path.join("./sample", filename)
-        
-        if not os.path.exists(sample_path):
-            st.error(f"❌ Sample file not found: {filename}")
-            return
-        
-        # Read the file
-        with open(sample_path, 'rb') as f:
-            file_content = f.read()
-        
-        # Create a mock uploaded file object
-        class MockUploadedFile:
-            def __init__(self, content, name):
-                self._content = content
-                self.name = name
-            
-            def getvalue(self):
-                return self._content
-        
-        mock_file = MockUploadedFile(file_content, filename)
+        sample_file = _SampleFile((SAMPLE_DIR / filename).read_bytes(), filename)
         
         st.success(f"📄 Loading sample document: **{filename}**")
         
         # Process the sample document
-        process_uploaded_document(mock_file)
+        process_uploaded_document(sample_file)
         
+    except FileNotFoundError:
+        st.error(f"❌ Sample file not found: {filename}")
     except Exception as e:
         st.error(f"❌ Error loading sample document: {str(e)}")
-
-
-def load_sample_document(doc_type: str):
-    """Load a sample document for demonstration."""
-    sample_docs = {
-        "rental": {
-            "filename": "sample_rental_agreement.pdf",
-            "type": "rental",
-            "text": """
-            RESIDENTIAL LEASE AGREEMENT
-            
-            This Lease Agreement is entered into between John Smith (Landlord) and Jane Doe (Tenant) 
-            for the property located at 123 Main Street, Mumbai, Maharashtra.
-            
-            RENT: Tenant agrees to pay Rs. 25,000 per month, due on the 1st of each month. 
-            Late payments will incur a penalty of Rs. 1,000 per day.
-            
-            SECURITY DEPOSIT: Tenant shall pay a security deposit of Rs. 75,000, which is 
-            non-refundable except for damage assessment.
-            
-            TERMINATION: Either party may terminate this lease with 30 days written notice. 
-            Early termination by Tenant results in forfeiture of security deposit.
-            
-            MAINTENANCE: Tenant is responsible for all repairs and maintenance, including 
-            structural repairs, regardless of cause.
-            
-            The property is leased "as-is" with no warranties. Landlord is not liable for 
-            any damages or injuries occurring on the premises.
-            """,
-        },
-        "loan": {
-            "filename": "sample_loan_agreement.pdf",
-            "type": "loan",
-            "text": """
-            PERSONAL LOAN AGREEMENT
-            
-            Borrower: Rajesh Kumar
-            Lender: QuickCash Financial Services Pvt Ltd
-            Principal Amount: Rs. 2,00,000
-            
-            INTEREST RATE: 24% per annum (APR 28.5% including processing fees)
-            
-            REPAYMENT: 24 monthly installments of Rs. 12,500 each
-            Total repayment amount: Rs. 3,00,000
-            
-            LATE PAYMENT PENALTY: Rs. 500 per day for any late payment
-            
-            DEFAULT: If payment is late by more than 7 days, the entire remaining 
-            balance becomes immediately due and payable.
-            
-            COLLATERAL: Borrower pledges gold ornaments worth Rs. 2,50,000 as security.
-            Lender may seize collateral immediately upon default.
-            
-            ARBITRATION: All disputes shall be resolved through binding arbitration. 
-            Borrower waives right to jury trial.
-            
-            Processing fee: Rs. 10,000 (non-refundable)
-            Documentation charges: Rs. 5,000
-            """,
-        },
-        "employment": {
-            "filename": "sample_employment_contract.docx",  # Changed to DOCX
-            "type": "employment",
-            "text": """
-            EMPLOYMENT CONTRACT
-            
-            Employee: Priya Sharma
-            Company: TechCorp India Private Limited
-            Position: Software Developer
-            Start Date: January 1, 2024
-            
-            SALARY: Rs. 8,00,000 per annum, payable monthly
-            
-            WORKING HOURS: 45 hours per week, including mandatory weekend work when required
-            
-            NON-COMPETE: Employee shall not work for any competing company for 2 years 
-            after termination, within India or globally.
-            
-            CONFIDENTIALITY: Employee agrees to maintain strict confidentiality of all 
-            company information indefinitely, even after termination.
-            
-            TERMINATION: Company may terminate employment at any time without cause or notice. 
-            Employee must provide 90 days notice to resign.
-            
-            NO MOONLIGHTING: Employee shall not engage in any other work or business 
-            activities during employment.
-            
-            INTELLECTUAL PROPERTY: All work created by employee belongs entirely to company, 
-            including personal projects done outside work hours.
-            """,
-        },
-    }
-
-    if doc_type in sample_docs:
-        sample = sample_docs[doc_type]
-        from ..utils.helpers import generate_document_id
-
-        # Store in session state
-        doc_id = generate_document_id()
-        st.session_state.current_document = {
-            "id": doc_id,
-            "filename": sample["filename"],
-            "document_type": sample["type"],
-            "original_text": sample["text"],
-            "is_sample": True,
-        }
-
-        st.success(f"📄 Loaded sample {doc_type} document. Processing...")
-
-        # Simulate processing for demo
-        with st.spinner("Analyzing sample document..."):
-            time.sleep(2)
-
-        st.rerun()
@@ -1,25 +1,88 @@
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Iterable, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-import json
+from langchain_core.output_parsers import StrOutputParser
+from pydantic import ValidationError
+import streamlit as st
+import orjson
+import re
 import time
 
+from src.services.llm_cache import LLMCache
 from src.utils.config import config
 from src.utils.logger import log_error, log_analysis_start, log_analysis_complete
-from src.models.document import (
-    DocumentType,
-    RiskLevel,
-    RiskCategory,
-    RiskFactor,
-    ClausePosition,
-)
+from src.models.document import DocumentType, RiskFactor, RiskFactorList
 from src.utils.helpers import (
     calculate_risk_score,
     extract_key_dates,
     extract_financial_terms,
 )
 
+# A JSON object inside the Markdown code fence some responses are wrapped in
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(\{.*\})\s*```", re.DOTALL)
+
+
+def _parse_llm_json(result: str) -> Dict[str, Any]:
+    """Parse the JSON object in a model response.
+
+    Takes the object out of a Markdown code fence if there is one and, if that
+    still doesn't parse, retries on the outermost {...} span to drop any
+    prose around the object. Raises ValueError when no JSON object can be
+    recovered.
+    """
+    fenced = _JSON_FENCE.search(result)
+    stripped = fenced.group(1) if fenced else result.strip()
+    try:
+        data = orjson.loads(stripped)
+    except orjson.JSONDecodeError:
+        start, end = stripped.find("{"), stripped.rfind("}")
+        if start == -1 or end <= start:
+            raise
+        data = orjson.loads(stripped[start : end + 1])
+
+    if not isinstance(data, dict):
+        raise ValueError("Response is not a dictionary")
+    return data
+
+
+def _locate_clauses(
+    text: str, clauses: Iterable[Any]
+) -> Dict[str, Dict[str, int]]:
+    """Map each distinct clause to the span of its first occurrence in text."""
+    positions = {}
+    for clause in {clause for clause in clauses if isinstance(clause, str) and clause}:
+        start_index = text.find(clause)
+        if start_index != -1:
+            positions[clause] = {
+                "start_index": start_index,
+                "end_index": start_index + len(clause),
+            }
+
+    return positions
+
+
+# Common risk indicators, for picking risks out of an unparseable response
+_RISK_KEYWORD_PATTERN = re.compile(
+    "risk|problematic|concern|warning|caution|penalty|fee", re.IGNORECASE
+)
+
+
+# Returned by answer_question when the model call fails
+QA_FALLBACK_ANSWER = "Sorry, I couldn't process your question. Please try again."
+
+# Markers of the fallback results returned when an analysis call fails
+RISK_FALLBACK_ASSESSMENT = "Analysis failed"
+SIMPLIFY_FALLBACK_POINT = "Simplification failed - showing original text"
+SUMMARY_FALLBACK = "Unable to generate summary"
+
+# Markers of the results built when the model's JSON response can't be parsed
+RISK_UNPARSED_ASSESSMENT = (
+    "Risk analysis completed with limited parsing. Please review manually."
+)
+RISK_EXTRACT_FAILED_ASSESSMENT = "Unable to analyze risks - please try again"
+SIMPLIFY_UNPARSED_POINT = "Document content requires legal review"
+
 
 class AIAnalyzer:
     def __init__(self):
@@ -30,20 +93,54 @@ class AIAnalyzer:
             max_output_tokens=config.MAX_TOKENS,
         )
 
+        # Responses to identical prompts are served from disk
+        self.llm_cache = LLMCache()
+
         # Initialize prompt templates
         self._setup_prompts()
 
+    def _run_prompt(
+        self,
+        prompt: PromptTemplate,
+        validate: Optional[Callable[[str], Any]] = None,
+        **inputs: Any,
+    ) -> str:
+        """Send one of the prompts to the model, reusing cached responses.
+
+        The template is rendered once with str.format, and that string is both
+        the cache key and the model input. A new response is only cached once
+        validate (if given) accepts it without raising ValueError, so a
+        malformed response is asked for again on the next call.
+        """
+        rendered = prompt.template.format(**inputs)
+        key = LLMCache.make_key(rendered, config.CHAT_MODEL, config.TEMPERATURE)
+        cached = self.llm_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self.generate.invoke(rendered)
+        if validate is not None:
+            try:
+                validate(result)
+            except ValueError:
+                return result
+
+        self.llm_cache.set(key, result)
+        return result
+
     def _setup_prompts(self):
-        """Set up prompt templates for different analysis tasks."""
+        """Set up prompt templates for different analysis tasks.
+
+        Each template keeps its fixed instructions first and the per-document
+        fields last, so consecutive requests share a common prefix that
+        Gemini's implicit context caching can reuse.
+        """
 
         # Risk analysis prompt
         self.risk_analysis_prompt = PromptTemplate(
             input_variables=["text", "document_type"],
             template="""
-            Analyze the following {document_type} document for potential risks and problematic clauses.
-            
-            Document text:
-            {text}
+            Analyze the legal document at the end of this prompt for potential risks and problematic clauses.
             
             Please identify:
             1. High-risk clauses that could be problematic for the signer
@@ -72,6 +169,11 @@ class AIAnalyzer:
                 ],
                 "overall_assessment": "brief summary of document risk level"
             }}
+            
+            Document type: {document_type}
+            
+            Document text:
+            {text}
             """,
         )
 
@@ -79,10 +181,7 @@ class AIAnalyzer:
         self.simplification_prompt = PromptTemplate(
             input_variables=["text", "document_type"],
             template="""
-            Convert the following legal text into plain, simple English that anyone can understand.
-            
-            Document type: {document_type}
-            Legal text: {text}
+            Convert the legal text at the end of this prompt into plain, simple English that anyone can understand.
             
             Rules for simplification:
             1. Use everyday language instead of legal jargon
@@ -99,6 +198,9 @@ class AIAnalyzer:
                 "key_points": ["main point 1", "main point 2", "main point 3"],
                 "jargon_definitions": {{"legal term": "simple definition"}}
             }}
+            
+            Document type: {document_type}
+            Legal text: {text}
             """,
         )
 
@@ -106,9 +208,7 @@ class AIAnalyzer:
         self.summary_prompt = PromptTemplate(
             input_variables=["text", "document_type"],
             template="""
-            Create a concise summary of this {document_type} document.
-            
-            Document: {text}
+            Create a concise summary of the legal document at the end of this prompt.
             
             Provide a summary that includes:
             1. What type of agreement this is
@@ -118,9 +218,32 @@ class AIAnalyzer:
             5. Major benefits and risks
             
             Keep it under 200 words and focus on what matters most to the person signing.
+            
+            Document type: {document_type}
+            Document: {text}
             """,
         )
 
+        # Question answering prompt
+        self.qa_prompt = PromptTemplate(
+            input_variables=["question", "document", "doc_type"],
+            template="""
+            Answer the question at the end of this prompt about the document below.
+            Be specific and cite relevant parts of the document.
+            Provide a clear, helpful answer based only on the document content.
+            If the answer isn't in the document, say so clearly.
+            
+            Document type: {doc_type}
+            Document: {document}
+            
+            Question: {question}
+            """,
+        )
+
+        # Model call shared by every prompt; templates are rendered in
+        # _run_prompt rather than by a PromptTemplate step in the chain
+        self.generate = self.llm | StrOutputParser()
+
     def analyze_document_risk(
         self, text: str, document_type: DocumentType
     ) -> Dict[str, Any]:
@@ -129,33 +252,17 @@ class AIAnalyzer:
             log_analysis_start("risk_analysis")
             start_time = time.time()
 
-            # Create and run the risk analysis chain
-            risk_chain = LLMChain(llm=self.llm, prompt=self.risk_analysis_prompt)
-
-            result = risk_chain.run(
+            # Run the risk analysis prompt
+            result = self._run_prompt(
+                self.risk_analysis_prompt,
+                validate=_parse_llm_json,
                 text=text[:4000],  # Limit text size for API
                 document_type=document_type.value,
             )
 
             # Parse JSON response with better error handling
             try:
-                # Try to extract JSON from the response if it's wrapped in markdown
-                if "```json" in result:
-                    json_start = result.find("```json") + 7
-                    json_end = result.find("```", json_start)
-                    if json_end != -1:
-                        result = result[json_start:json_end].strip()
-
-                # Clean up the result string
-                result = result.strip()
-                if result.startswith("```") and result.endswith("```"):
-                    result = result[3:-3].strip()
-
-                risk_data = json.loads(result)
-
-                # Validate the structure
-                if not isinstance(risk_data, dict):
-                    raise ValueError("Response is not a dictionary")
+                risk_data = _parse_llm_json(result)
 
                 if "risk_factors" not in risk_data:
                     risk_data["risk_factors"] = []
@@ -163,7 +270,7 @@ class AIAnalyzer:
                 if "overall_assessment" not in risk_data:
                     risk_data["overall_assessment"] = "Analysis completed"
 
-            except (json.JSONDecodeError, ValueError) as e:
+            except ValueError as e:
                 log_error(f"JSON parsing error in risk analysis: {str(e)}")
                 log_error(f"Raw AI response: {result[:500]}...")
 
@@ -177,7 +284,7 @@ class AIAnalyzer:
 
         except Exception as e:
             log_error(f"Error in risk analysis: {str(e)}")
-            return {"risk_factors": [], "overall_assessment": "Analysis failed"}
+            return {"risk_factors": [], "overall_assessment": RISK_FALLBACK_ASSESSMENT}
 
     def _extract_risk_fallback(
         self, response: str, original_text: str
@@ -187,25 +294,9 @@ class AIAnalyzer:
             risk_factors = []
 
             # Look for common risk indicators in the response
-            risk_keywords = [
-                "risk",
-                "problematic",
-                "concern",
-                "warning",
-                "caution",
-                "penalty",
-                "fee",
-            ]
-            sentences = response.split(".")
-
-            for i, sentence in enumerate(sentences):
+            for sentence in response.split("."):
                 sentence = sentence.strip()
-                if (
-                    any(
-                        keyword.lower() in sentence.lower() for keyword in risk_keywords
-                    )
-                    and len(sentence) > 20
-                ):
+                if len(sentence) > 20 and _RISK_KEYWORD_PATTERN.search(sentence):
                     risk_factors.append(
                         {
                             "clause_text": sentence[:200],  # Limit length
@@ -221,46 +312,29 @@ class AIAnalyzer:
 
             return {
                 "risk_factors": risk_factors,
-                "overall_assessment": "Risk analysis completed with limited parsing. Please review manually.",
+                "overall_assessment": RISK_UNPARSED_ASSESSMENT,
             }
 
         except Exception as e:
             log_error(f"Error in fallback risk extraction: {str(e)}")
             return {
                 "risk_factors": [],
-                "overall_assessment": "Unable to analyze risks - please try again",
+                "overall_assessment": RISK_EXTRACT_FAILED_ASSESSMENT,
             }
 
     def simplify_text(self, text: str, document_type: DocumentType) -> Dict[str, Any]:
         """Convert legal text to plain language."""
         try:
-            simplification_chain = LLMChain(
-                llm=self.llm, prompt=self.simplification_prompt
-            )
-
-            result = simplification_chain.run(
-                text=text[:3000], document_type=document_type.value  # Limit text size
+            result = self._run_prompt(
+                self.simplification_prompt,
+                validate=_parse_llm_json,
+                text=text[:3000],  # Limit text size
+                document_type=document_type.value,
             )
 
             # Parse JSON response with better error handling
             try:
-                # Try to extract JSON from the response if it's wrapped in markdown
-                if "```json" in result:
-                    json_start = result.find("```json") + 7
-                    json_end = result.find("```", json_start)
-                    if json_end != -1:
-                        result = result[json_start:json_end].strip()
-
-                # Clean up the result string
-                result = result.strip()
-                if result.startswith("```") and result.endswith("```"):
-                    result = result[3:-3].strip()
-
-                simplified_data = json.loads(result)
-
-                # Validate the structure
-                if not isinstance(simplified_data, dict):
-                    raise ValueError("Response is not a dictionary")
+                simplified_data = _parse_llm_json(result)
 
                 # Ensure required keys exist
                 if "simplified_text" not in simplified_data:
@@ -270,12 +344,12 @@ class AIAnalyzer:
                 if "jargon_definitions" not in simplified_data:
                     simplified_data["jargon_definitions"] = {}
 
-            except (json.JSONDecodeError, ValueError) as e:
+            except ValueError as e:
                 log_error(f"JSON parsing error in text simplification: {str(e)}")
                 simplified_data = {
                     "simplified_text": text[:500]
                     + "... (Full simplification unavailable)",
-                    "key_points": ["Document content requires legal review"],
+                    "key_points": [SIMPLIFY_UNPARSED_POINT],
                     "jargon_definitions": {},
                 }
 
@@ -286,48 +360,48 @@ class AIAnalyzer:
             return {
                 "simplified_text": text[:500]
                 + "...",  # Return truncated original if simplification fails
-                "key_points": ["Simplification failed - showing original text"],
+                "key_points": [SIMPLIFY_FALLBACK_POINT],
                 "jargon_definitions": {},
             }
 
     def generate_summary(self, text: str, document_type: DocumentType) -> str:
         """Generate a concise document summary."""
         try:
-            summary_chain = LLMChain(llm=self.llm, prompt=self.summary_prompt)
-
-            summary = summary_chain.run(
-                text=text[:3000], document_type=document_type.value  # Limit text size
+            summary = self._run_prompt(
+                self.summary_prompt,
+                text=text[:3000],  # Limit text size
+                document_type=document_type.value,
             )
 
             return summary.strip()
 
         except Exception as e:
             log_error(f"Error generating summary: {str(e)}")
-            return "Unable to generate summary"
+            return SUMMARY_FALLBACK
+
+    def analyze_all(
+        self, text: str, document_type: DocumentType
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], str]:
+        """Run risk analysis, simplification and summary concurrently.
+
+        The three calls are independent network round-trips, so they are
+        overlapped on worker threads rather than an asyncio loop: the Gemini
+        client keeps its async transport bound to the first event loop it
+        sees, which breaks when each call runs under a fresh asyncio.run().
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            risk = executor.submit(self.analyze_document_risk, text, document_type)
+            simplified = executor.submit(self.simplify_text, text, document_type)
+            summary = executor.submit(self.generate_summary, text, document_type)
+            return risk.result(), simplified.result(), summary.result()
 
     def answer_question(
         self, question: str, document_text: str, document_type: DocumentType
     ) -> str:
         """Answer a question about the document."""
         try:
-            qa_prompt = PromptTemplate(
-                input_variables=["question", "document", "doc_type"],
-                template="""
-                Answer the following question about this {doc_type} document. 
-                Be specific and cite relevant parts of the document.
-                
-                Document: {document}
-                
-                Question: {question}
-                
-                Provide a clear, helpful answer based only on the document content.
-                If the answer isn't in the document, say so clearly.
-                """,
-            )
-
-            qa_chain = LLMChain(llm=self.llm, prompt=qa_prompt)
-
-            answer = qa_chain.run(
+            answer = self._run_prompt(
+                self.qa_prompt,
                 question=question,
                 document=document_text[:3000],  # Limit context size
                 doc_type=document_type.value,
@@ -337,42 +411,70 @@ class AIAnalyzer:
 
         except Exception as e:
             log_error(f"Error answering question: {str(e)}")
-            return "Sorry, I couldn't process your question. Please try again."
+            return QA_FALLBACK_ANSWER
 
     def create_risk_factors(
         self, risk_data: Dict[str, Any], text: str
     ) -> List[RiskFactor]:
         """Convert AI analysis results to RiskFactor objects."""
-        risk_factors = []
+        raw_factors = []
+        factors = risk_data.get("risk_factors", [])
+        positions = _locate_clauses(
+            text,
+            (
+                factor_data.get("clause_text")
+                for factor_data in factors
+                if isinstance(factor_data, dict)
+            ),
+        )
 
-        for factor_data in risk_data.get("risk_factors", []):
-            try:
-                # Find clause position in text
-                clause_text = factor_data.get("clause_text", "")
-                position = None
-
-                if clause_text:
-                    start_index = text.find(clause_text)
-                    if start_index != -1:
-                        position = ClausePosition(
-                            start_index=start_index,
-                            end_index=start_index + len(clause_text),
-                        )
-
-                risk_factor = RiskFactor(
-                    id=f"risk_{len(risk_factors) + 1}",
-                    clause_text=clause_text,
-                    category=RiskCategory(factor_data.get("category", "standard")),
-                    severity=RiskLevel(factor_data.get("severity", "low")),
-                    explanation=factor_data.get("explanation", ""),
-                    suggestion=factor_data.get("suggestion"),
-                    position=position,
-                )
+        for factor_data in factors:
+            if not isinstance(factor_data, dict):
+                log_error(f"Error creating risk factor: unexpected {factor_data!r}")
+                continue
 
-                risk_factors.append(risk_factor)
+            clause_text = factor_data.get("clause_text", "")
+            # Only strings were located; other types fail validation below
+            position = (
+                positions.get(clause_text) if isinstance(clause_text, str) else None
+            )
 
-            except Exception as e:
+            raw_factors.append(
+                {
+                    "clause_text": clause_text,
+                    "category": factor_data.get("category", "standard"),
+                    "severity": factor_data.get("severity", "low"),
+                    "explanation": factor_data.get("explanation", ""),
+                    "suggestion": factor_data.get("suggestion"),
+                    "position": position,
+                }
+            )
+
+        numbered = [
+            {"id": f"risk_{i + 1}", **raw} for i, raw in enumerate(raw_factors)
+        ]
+        try:
+            return RiskFactorList.validate_python(numbered)
+        except ValidationError:
+            pass
+
+        # Validate one by one so a single bad factor doesn't drop the rest
+        risk_factors = []
+        for raw in raw_factors:
+            try:
+                risk_factors.append(
+                    RiskFactor.model_validate(
+                        {"id": f"risk_{len(risk_factors) + 1}", **raw}
+                    )
+                )
+            except ValidationError as e:
                 log_error(f"Error creating risk factor: {str(e)}")
                 continue
 
         return risk_factors
+
+
+@st.cache_resource(show_spinner=False)
+def get_ai_analyzer() -> AIAnalyzer:
+    """Create the Gemini-backed analyzer once and share it across reruns."""
+    return AIAnalyzer()
@@ -1,15 +1,58 @@
 from typing import BinaryIO, Optional
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
+from itertools import chain
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-import tempfile
-import os
+import re
+import streamlit as st
+from charset_normalizer import from_bytes
 from docx import Document
+from pypdf import PdfReader
 
 from src.utils.config import config
 from src.utils.logger import log_error
 from src.models.document import DocumentType
 
 
+# Byte order marks and the encodings they identify (UTF-32 before UTF-16,
+# whose little-endian mark is a prefix of UTF-32's)
+_TEXT_BOMS = (
+    (b"\xef\xbb\xbf", "utf-8-sig"),
+    (b"\xff\xfe\x00\x00", "utf-32"),
+    (b"\x00\x00\xfe\xff", "utf-32"),
+    (b"\xff\xfe", "utf-16"),
+    (b"\xfe\xff", "utf-16"),
+)
+
+# Keywords that identify each document type
+_TYPE_KEYWORDS = {
+    DocumentType.RENTAL: frozenset(
+        ["lease", "rent", "tenant", "landlord", "property", "premises", "deposit"]
+    ),
+    DocumentType.LOAN: frozenset(
+        ["loan", "borrow", "lender", "principal", "interest", "repayment", "credit"]
+    ),
+    DocumentType.EMPLOYMENT: frozenset(
+        ["employment", "employee", "employer", "salary", "wages", "position", "job"]
+    ),
+    DocumentType.NDA: frozenset(
+        ["confidential", "non-disclosure", "proprietary", "trade secret"]
+    ),
+    DocumentType.SERVICE: frozenset(
+        ["service", "provider", "client", "deliverables", "scope of work"]
+    ),
+}
+
+# All keywords in one alternation, longest first so overlapping keywords
+# prefer the longer match
+_TYPE_KEYWORD_PATTERN = re.compile(
+    "|".join(
+        re.escape(keyword)
+        for keyword in sorted(
+            set().union(*_TYPE_KEYWORDS.values()), key=len, reverse=True
+        )
+    )
+)
+
+
 class DocumentProcessor:
     def __init__(self):
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -18,97 +61,76 @@ class DocumentProcessor:
             length_function=len,
         )
 
-    def extract_text_from_pdf(self, file_content: bytes, filename: str) -> str:
-        """Extract text from PDF using LangChain PyPDFLoader."""
+    def extract_text_from_pdf(self, file: BinaryIO, filename: str) -> str:
+        """Extract text from PDF with pypdf, reading the stream directly."""
         try:
-            # Save uploaded file to temporary location
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
-
-            # Use LangChain PyPDFLoader
-            loader = PyPDFLoader(temp_file_path)
-            documents = loader.load()
-
-            # Combine all pages
-            text = "\n".join([doc.page_content for doc in documents])
-
-            # Clean up temporary file
-            os.unlink(temp_file_path)
-
-            return text
+            # Same per-page extraction as LangChain's PyPDFLoader, without
+            # the temporary file and per-page Document objects
+            reader = PdfReader(file)
+            return "\n".join(page.extract_text().strip() for page in reader.pages)
 
         except Exception as e:
             log_error(f"Error extracting text from PDF: {str(e)}")
             return ""
 
-    def extract_text_from_txt(self, file_content: bytes, filename: str) -> str:
+    def extract_text_from_txt(self, file: BinaryIO, filename: str) -> str:
         """Extract text from TXT file."""
         try:
-            # Try different encodings
-            encodings = ["utf-8", "utf-16", "latin-1", "cp1252"]
+            file_content = file.read()
+
+            # A byte order mark settles the encoding without any guessing
+            for bom, encoding in _TEXT_BOMS:
+                if file_content.startswith(bom):
+                    return file_content.decode(encoding, errors="ignore")
 
-            for encoding in encodings:
-                try:
-                    text = file_content.decode(encoding)
-                    return text
-                except UnicodeDecodeError:
-                    continue
+            # Most uploads are UTF-8; only detect the encoding otherwise
+            try:
+                return file_content.decode("utf-8")
+            except UnicodeDecodeError:
+                pass
 
-            # If all encodings fail, use utf-8 with error handling
-            return file_content.decode("utf-8", errors="ignore")
+            best = from_bytes(file_content).best()
+            encoding = best.encoding if best else "utf-8"
+            return file_content.decode(encoding, errors="ignore")
 
         except Exception as e:
             log_error(f"Error extracting text from TXT: {str(e)}")
             return ""
 
-    def extract_text_from_docx(self, file_content: bytes, filename: str) -> str:
+    def extract_text_from_docx(self, file: BinaryIO, filename: str) -> str:
         """Extract text from DOCX file."""
         try:
-            # Save uploaded file to temporary location
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".docx") as temp_file:
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
-
-            # Use python-docx to extract text
-            from docx import Document as DocxDocument
-
-            doc = DocxDocument(temp_file_path)
-
-            # Extract text from all paragraphs
-            text_parts = []
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_parts.append(paragraph.text)
-
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            text_parts.append(cell.text)
-
-            # Clean up temporary file
-            os.unlink(temp_file_path)
-
-            # Join all text parts
-            full_text = "\n".join(text_parts)
-            return full_text
+            # python-docx reads file-like objects directly
+            doc = Document(file)
+
+            # Paragraphs first, then table cells; each .text walks the XML,
+            # so it is read once per element
+            paragraphs = (paragraph.text for paragraph in doc.paragraphs)
+            cells = (
+                cell.text
+                for table in doc.tables
+                for row in table.rows
+                for cell in row.cells
+            )
+            return "\n".join(
+                part for part in chain(paragraphs, cells) if part.strip()
+            )
 
         except Exception as e:
             log_error(f"Error extracting text from DOCX: {str(e)}")
             return ""
 
-    def extract_text(self, file_content: bytes, filename: str) -> str:
-        """Extract text based on file extension."""
+    def extract_text(self, file: BinaryIO, filename: str) -> str:
+        """Extract text from a file-like object based on file extension."""
         file_ext = filename.lower().split(".")[-1]
+        file.seek(0)
 
         if file_ext == "pdf":
-            return self.extract_text_from_pdf(file_content, filename)
+            return self.extract_text_from_pdf(file, filename)
         elif file_ext == "txt":
-            return self.extract_text_from_txt(file_content, filename)
+            return self.extract_text_from_txt(file, filename)
         elif file_ext in ["docx", "doc"]:
-            return self.extract_text_from_docx(file_content, filename)
+            return self.extract_text_from_docx(file, filename)
         else:
             log_error(f"Unsupported file type: {file_ext}")
             return ""
@@ -119,70 +141,12 @@ class DocumentProcessor:
 
     def detect_document_type(self, text: str) -> DocumentType:
         """Detect document type based on content."""
-        text_lower = text.lower()
-
-        # Rental agreement keywords
-        rental_keywords = [
-            "lease",
-            "rent",
-            "tenant",
-            "landlord",
-            "property",
-            "premises",
-            "deposit",
-        ]
-
-        # Loan agreement keywords
-        loan_keywords = [
-            "loan",
-            "borrow",
-            "lender",
-            "principal",
-            "interest",
-            "repayment",
-            "credit",
-        ]
-
-        # Employment keywords
-        employment_keywords = [
-            "employment",
-            "employee",
-            "employer",
-            "salary",
-            "wages",
-            "position",
-            "job",
-        ]
-
-        # NDA keywords
-        nda_keywords = ["confidential", "non-disclosure", "proprietary", "trade secret"]
-
-        # Service agreement keywords
-        service_keywords = [
-            "service",
-            "provider",
-            "client",
-            "deliverables",
-            "scope of work",
-        ]
-
-        # Count keyword matches
+        # One scan over the text for every category's keywords; a category
+        # scores one point per distinct keyword found
+        found = {m.group() for m in _TYPE_KEYWORD_PATTERN.finditer(text.lower())}
         scores = {
-            DocumentType.RENTAL: sum(
-                1 for keyword in rental_keywords if keyword in text_lower
-            ),
-            DocumentType.LOAN: sum(
-                1 for keyword in loan_keywords if keyword in text_lower
-            ),
-            DocumentType.EMPLOYMENT: sum(
-                1 for keyword in employment_keywords if keyword in text_lower
-            ),
-            DocumentType.NDA: sum(
-                1 for keyword in nda_keywords if keyword in text_lower
-            ),
-            DocumentType.SERVICE: sum(
-                1 for keyword in service_keywords if keyword in text_lower
-            ),
+            doc_type: len(found & keywords)
+            for doc_type, keywords in _TYPE_KEYWORDS.items()
         }
 
         # Return type with highest score, or OTHER if no clear match
@@ -193,10 +157,17 @@ class DocumentProcessor:
 
     def extract_metadata(self, text: str) -> dict:
         """Extract metadata from document text."""
+        word_count = len(text.split())
         metadata = {
-            "word_count": len(text.split()),
+            "word_count": word_count,
             "character_count": len(text),
-            "estimated_reading_time": len(text.split()) // 200,  # Assuming 200 WPM
+            "estimated_reading_time": word_count // 200,  # Assuming 200 WPM
         }
 
         return metadata
+
+
+@st.cache_resource(show_spinner=False)
+def get_doc_processor() -> DocumentProcessor:
+    """Create the document processor once and share it across reruns."""
+    return DocumentProcessor()
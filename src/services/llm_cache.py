@@ -0,0 +1,104 @@
+from typing import Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from src.utils.config import config
+from src.utils.logger import log_error
+
+
+class LLMCache:
+    """Exact-match cache of model responses, persisted in SQLite.
+
+    Entries are keyed on a SHA-256 of the model name, temperature and fully
+    rendered prompt, so a hit only ever returns the response to the very
+    same request.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.db_path = db_path or os.path.join(config.DATA_DIR, "llm_cache.db")
+        self.ttl_seconds = (
+            config.CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self.enabled = config.ENABLE_CACHE if enabled is None else enabled
+
+        # The analyzer is shared across sessions and called from worker
+        # threads, so one connection is used under a lock
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if self.enabled:
+            try:
+                os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS responses_created ON responses (created)"
+                )
+                self._purge_expired()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                log_error(f"LLM cache disabled: {str(e)}")
+                self.enabled = False
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float) -> str:
+        """Hash one model request into a cache key."""
+        payload = json.dumps(
+            {"model": model, "prompt": prompt, "temperature": temperature},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT response, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                log_error(f"Error reading LLM cache: {str(e)}")
+                row = None
+
+            if row is None or time.time() - row[1] > self.ttl_seconds:
+                return None
+
+            return row[0]
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response under key."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created) "
+                    "VALUES (?, ?, ?)",
+                    (key, response, time.time()),
+                )
+                self._purge_expired()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                log_error(f"Error writing LLM cache: {str(e)}")
+
+    def _purge_expired(self) -> None:
+        """Delete entries older than the TTL; the caller commits."""
+        self._conn.execute(
+            "DELETE FROM responses WHERE created < ?", (time.time() - self.ttl_seconds,)
+        )
@@ -1,12 +1,25 @@
 from typing import List, Dict, Any, Optional
+from itertools import takewhile
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_chroma import Chroma
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
 from langchain.schema import Document
 import os
+import threading
+import time
+import streamlit as st
 
 from src.utils.config import config
 from src.utils.logger import log_error
 from src.models.document import Document as DocModel
+from src.services.document_processor import get_doc_processor
+
+# Largest l2 distance at which a chunk is used as Q&A context
+CONTEXT_MAX_DISTANCE = 0.8
+
+# Longest the cached chunk count may go without re-reading it from Chroma
+COUNT_RESYNC_SECONDS = 60
 
 
 class VectorStoreService:
@@ -16,6 +29,18 @@ class VectorStoreService:
             model=config.EMBEDDING_MODEL, google_api_key=config.GOOGLE_API_KEY
         )
 
+        # Keep chunk embeddings on disk keyed by a hash of their text, so
+        # re-ingesting a document (or a repeated chunk) is not embedded again.
+        # Misses are sent in batches of 100, the API's per-request maximum.
+        if config.ENABLE_CACHE:
+            self.embeddings = CacheBackedEmbeddings.from_bytes_store(
+                self.embeddings,
+                LocalFileStore(os.path.join(config.DATA_DIR, "embedding_cache")),
+                namespace=config.EMBEDDING_MODEL,
+                batch_size=100,
+                key_encoder="sha256",
+            )
+
         # Ensure Chroma directory exists
         os.makedirs(config.CHROMA_PERSIST_DIR, exist_ok=True)
 
@@ -24,15 +49,35 @@ class VectorStoreService:
             persist_directory=config.CHROMA_PERSIST_DIR,
             embedding_function=self.embeddings,
             collection_name="lega_documents",
+            # HNSW graph settings; only applied when the collection is created.
+            # The default l2 space is kept because CONTEXT_MAX_DISTANCE is an
+            # l2 distance.
+            collection_configuration={
+                "hnsw": {"ef_construction": 200, "max_neighbors": 32, "ef_search": 64}
+            },
         )
 
+        # Chunk count for get_document_stats, kept up to date by add/remove
+        # and resynced from Chroma now and then to catch other writers
+        self._count_lock = threading.Lock()
+        self._chunk_count: Optional[int] = None
+        self._last_resync = 0.0
+
     def add_document(
-        self, document_id: str, text: str, metadata: Dict[str, Any] = None
+        self,
+        document_id: str,
+        chunks: Optional[List[str]] = None,
+        text: Optional[str] = None,
+        metadata: Dict[str, Any] = None,
     ) -> bool:
-        """Add a document to the vector store."""
+        """Add a document to the vector store.
+
+        Pass the chunks already produced by DocumentProcessor; raw text is
+        only split here when no chunks are given.
+        """
         try:
-            # Create document chunks for better retrieval
-            chunks = self._chunk_document(text)
+            if chunks is None:
+                chunks = get_doc_processor().split_text_into_chunks(text or "")
 
             documents = []
             metadatas = []
@@ -52,6 +97,7 @@ class VectorStoreService:
 
             # Add to vector store
             self.vector_store.add_texts(texts=documents, metadatas=metadatas, ids=ids)
+            self._adjust_chunk_count(len(ids))
 
             return True
 
@@ -111,15 +157,18 @@ class VectorStoreService:
     ) -> str:
         """Get relevant context from a document for Q&A."""
         try:
-            results = self.search_document_clauses(document_id, query, k=max_chunks)
-
-            # Combine relevant chunks
-            context_parts = []
-            for result in results:
-                if result["similarity_score"] < 0.8:  # Only use highly relevant chunks
-                    context_parts.append(result["content"])
+            results = self.vector_store.similarity_search_with_score(
+                query=query, k=max_chunks, filter={"document_id": document_id}
+            )
 
-            return "\n\n".join(context_parts)
+            # Results come back nearest first, so stop at the first chunk that
+            # isn't highly relevant
+            return "\n\n".join(
+                doc.page_content
+                for doc, score in takewhile(
+                    lambda result: result[1] < CONTEXT_MAX_DISTANCE, results
+                )
+            )
 
         except Exception as e:
             log_error(f"Error getting document context: {str(e)}")
@@ -134,6 +183,7 @@ class VectorStoreService:
             if results and results.get("ids"):
                 # Delete all chunks
                 self.vector_store.delete(ids=results["ids"])
+                self._adjust_chunk_count(-len(results["ids"]))
 
             return True
 
@@ -144,9 +194,15 @@ class VectorStoreService:
     def get_document_stats(self) -> Dict[str, Any]:
         """Get statistics about the vector store."""
         try:
-            # Get collection info
-            collection = self.vector_store._collection
-            count = collection.count()
+            with self._count_lock:
+                now = time.monotonic()
+                if (
+                    self._chunk_count is None
+                    or now - self._last_resync > COUNT_RESYNC_SECONDS
+                ):
+                    self._chunk_count = self.vector_store._collection.count()
+                    self._last_resync = now
+                count = self._chunk_count
 
             return {
                 "total_documents": count,
@@ -158,28 +214,11 @@ class VectorStoreService:
             log_error(f"Error getting vector store stats: {str(e)}")
             return {"total_documents": 0}
 
-    def _chunk_document(
-        self, text: str, chunk_size: int = 1000, overlap: int = 200
-    ) -> List[str]:
-        """Split document into chunks for embedding."""
-        chunks = []
-        start = 0
-
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
-
-            # Try to break at sentence boundary
-            if end < len(text):
-                last_period = chunk.rfind(".")
-                if last_period > chunk_size // 2:
-                    chunk = chunk[: last_period + 1]
-                    end = start + last_period + 1
-
-            chunks.append(chunk.strip())
-            start = end - overlap
-
-        return [chunk for chunk in chunks if chunk.strip()]
+    def _adjust_chunk_count(self, delta: int) -> None:
+        """Apply a local add/remove to the cached chunk count."""
+        with self._count_lock:
+            if self._chunk_count is not None:
+                self._chunk_count += delta
 
     def find_similar_clauses(
         self, clause_text: str, exclude_document_id: str = None, k: int = 3
@@ -210,3 +249,9 @@ class VectorStoreService:
         except Exception as e:
             log_error(f"Error finding similar clauses: {str(e)}")
             return []
+
+
+@st.cache_resource(show_spinner=False)
+def get_vector_store() -> VectorStoreService:
+    """Open the Chroma store and embeddings client once and share them."""
+    return VectorStoreService()
@@ -1,175 +1,213 @@
+import functools
 import os
-from typing import Optional
-from dotenv import load_dotenv
+from dataclasses import dataclass
+from typing import Mapping, Optional
+from dotenv import dotenv_values, find_dotenv
 
-# Load environment variables
-load_dotenv()
 
+# Values of GOOGLE_API_KEY that mean it hasn't been set: empty, the
+# .env.example placeholder, or the older placeholder spelling
+_UNSET_API_KEYS = ("", "your-google-api-key-here", "your_google_ai_api_key_here")
 
+
+@dataclass(frozen=True, slots=True)
 class Config:
     # =============================================================================
     # GOOGLE AI API CONFIGURATION
     # =============================================================================
-    GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
+    GOOGLE_API_KEY: str
 
     # =============================================================================
     # APPLICATION SETTINGS
     # =============================================================================
-    DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
-    STREAMLIT_SERVER_PORT: int = int(os.getenv("STREAMLIT_SERVER_PORT", "8501"))
-    STREAMLIT_SERVER_ADDRESS: str = os.getenv("STREAMLIT_SERVER_ADDRESS", "localhost")
-    MAX_FILE_SIZE_MB: int = int(os.getenv("MAX_FILE_SIZE_MB", "10"))
-    SUPPORTED_FILE_TYPES: list = os.getenv(
-        "SUPPORTED_FILE_TYPES", "pdf,docx,txt"
-    ).split(",")
+    DEBUG: bool
+    STREAMLIT_SERVER_PORT: int
+    STREAMLIT_SERVER_ADDRESS: str
+    MAX_FILE_SIZE_MB: int
+    SUPPORTED_FILE_TYPES: list
 
     # =============================================================================
     # LOGGING
     # =============================================================================
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE: str = os.getenv("LOG_FILE", "./data/app.log")
+    LOG_LEVEL: str
+    LOG_FILE: str
 
     # =============================================================================
     # SECURITY
     # =============================================================================
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "development-key-change-in-production")
-    SESSION_TIMEOUT_MINUTES: int = int(os.getenv("SESSION_TIMEOUT_MINUTES", "60"))
+    SECRET_KEY: str
+    SESSION_TIMEOUT_MINUTES: int
 
     # =============================================================================
     # AI MODEL SETTINGS
     # =============================================================================
-    CHAT_MODEL: str = os.getenv("CHAT_MODEL", "gemini-1.5-flash")
-    TEMPERATURE: float = float(os.getenv("TEMPERATURE", "0.2"))
-    MAX_TOKENS: int = int(os.getenv("MAX_TOKENS", "2048"))
-    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "models/embedding-001")
+    CHAT_MODEL: str
+    TEMPERATURE: float
+    MAX_TOKENS: int
+    EMBEDDING_MODEL: str
 
     # =============================================================================
     # VECTOR STORE CONFIGURATION
     # =============================================================================
-    CHROMA_PERSIST_DIR: str = os.getenv("CHROMA_PERSIST_DIRECTORY", "./data/chroma_db")
+    CHROMA_PERSIST_DIR: str
 
     # =============================================================================
     # STORAGE CONFIGURATION
     # =============================================================================
-    UPLOAD_DIR: str = os.getenv("UPLOAD_DIR", "./uploads")
-    DATA_DIR: str = os.getenv("DATA_DIR", "./data")
-    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./data/lega.db")
+    UPLOAD_DIR: str
+    DATA_DIR: str
+    DATABASE_URL: str
 
     # =============================================================================
     # PERFORMANCE SETTINGS
     # =============================================================================
-    MAX_CONCURRENT_UPLOADS: int = int(os.getenv("MAX_CONCURRENT_UPLOADS", "5"))
-    DOCUMENT_PROCESSING_TIMEOUT: int = int(
-        os.getenv("DOCUMENT_PROCESSING_TIMEOUT", "300")
-    )
-    ENABLE_CACHE: bool = os.getenv("ENABLE_CACHE", "True").lower() == "true"
-    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "3600"))
+    MAX_CONCURRENT_UPLOADS: int
+    DOCUMENT_PROCESSING_TIMEOUT: int
+    ENABLE_CACHE: bool
+    CACHE_TTL_SECONDS: int
 
     # =============================================================================
     # FEATURE FLAGS
     # =============================================================================
-    ENABLE_DOCUMENT_LIBRARY: bool = (
-        os.getenv("ENABLE_DOCUMENT_LIBRARY", "True").lower() == "true"
-    )
-    ENABLE_QA_ASSISTANT: bool = (
-        os.getenv("ENABLE_QA_ASSISTANT", "True").lower() == "true"
-    )
-    ENABLE_MARKET_COMPARISON: bool = (
-        os.getenv("ENABLE_MARKET_COMPARISON", "True").lower() == "true"
-    )
-    ENABLE_TIMELINE_TRACKER: bool = (
-        os.getenv("ENABLE_TIMELINE_TRACKER", "True").lower() == "true"
-    )
-    ENABLE_EXPORT_FEATURES: bool = (
-        os.getenv("ENABLE_EXPORT_FEATURES", "True").lower() == "true"
-    )
+    ENABLE_DOCUMENT_LIBRARY: bool
+    ENABLE_QA_ASSISTANT: bool
+    ENABLE_MARKET_COMPARISON: bool
+    ENABLE_TIMELINE_TRACKER: bool
+    ENABLE_EXPORT_FEATURES: bool
 
     # =============================================================================
     # ANALYTICS & MONITORING
     # =============================================================================
-    ENABLE_ANALYTICS: bool = os.getenv("ENABLE_ANALYTICS", "False").lower() == "true"
-    ANALYTICS_API_KEY: str = os.getenv("ANALYTICS_API_KEY", "")
-    ENABLE_ERROR_TRACKING: bool = (
-        os.getenv("ENABLE_ERROR_TRACKING", "False").lower() == "true"
-    )
-    SENTRY_DSN: str = os.getenv("SENTRY_DSN", "")
+    ENABLE_ANALYTICS: bool
+    ANALYTICS_API_KEY: str
+    ENABLE_ERROR_TRACKING: bool
+    SENTRY_DSN: str
 
     # =============================================================================
     # REGIONAL SETTINGS
     # =============================================================================
-    DEFAULT_REGION: str = os.getenv("DEFAULT_REGION", "India")
-    DEFAULT_CURRENCY: str = os.getenv("DEFAULT_CURRENCY", "INR")
-    TIMEZONE: str = os.getenv("TIMEZONE", "Asia/Kolkata")
+    DEFAULT_REGION: str
+    DEFAULT_CURRENCY: str
+    TIMEZONE: str
 
     # =============================================================================
     # ADVANCED AI SETTINGS
     # =============================================================================
-    RISK_SENSITIVITY: int = int(os.getenv("RISK_SENSITIVITY", "3"))
-    SIMPLIFICATION_LEVEL: str = os.getenv("SIMPLIFICATION_LEVEL", "intermediate")
-    MAX_RISK_FACTORS: int = int(os.getenv("MAX_RISK_FACTORS", "10"))
+    RISK_SENSITIVITY: int
+    SIMPLIFICATION_LEVEL: str
+    MAX_RISK_FACTORS: int
 
     # =============================================================================
     # API RATE LIMITING
     # =============================================================================
-    API_REQUESTS_PER_MINUTE: int = int(os.getenv("API_REQUESTS_PER_MINUTE", "60"))
-    API_REQUESTS_PER_DAY: int = int(os.getenv("API_REQUESTS_PER_DAY", "1000"))
+    API_REQUESTS_PER_MINUTE: int
+    API_REQUESTS_PER_DAY: int
 
     # =============================================================================
     # BACKUP & MAINTENANCE
     # =============================================================================
-    ENABLE_AUTO_BACKUP: bool = (
-        os.getenv("ENABLE_AUTO_BACKUP", "False").lower() == "true"
-    )
-    BACKUP_INTERVAL_HOURS: int = int(os.getenv("BACKUP_INTERVAL_HOURS", "24"))
-    BACKUP_RETENTION_DAYS: int = int(os.getenv("BACKUP_RETENTION_DAYS", "30"))
-    AUTO_CLEANUP_TEMP_FILES: bool = (
-        os.getenv("AUTO_CLEANUP_TEMP_FILES", "True").lower() == "true"
-    )
-    CLEANUP_INTERVAL_HOURS: int = int(os.getenv("CLEANUP_INTERVAL_HOURS", "6"))
+    ENABLE_AUTO_BACKUP: bool
+    BACKUP_INTERVAL_HOURS: int
+    BACKUP_RETENTION_DAYS: int
+    AUTO_CLEANUP_TEMP_FILES: bool
+    CLEANUP_INTERVAL_HOURS: int
 
-    @classmethod
-    def validate_config(cls) -> bool:
+    def validate_config(self) -> bool:
         """Validate that required configuration is present."""
-        required_vars = ["GOOGLE_API_KEY"]
-
-        missing_vars = []
-        for var in required_vars:
-            value = getattr(cls, var, "")
-            if not value or value == "your_google_ai_api_key_here":
-                missing_vars.append(var)
-
-        if missing_vars:
-            print(
-                f"⚠️  Missing required environment variables: {', '.join(missing_vars)}"
-            )
+        # GOOGLE_API_KEY is the only required setting
+        if self.GOOGLE_API_KEY in _UNSET_API_KEYS:
+            print("⚠️  Missing required environment variables: GOOGLE_API_KEY")
             print("📝 Please update your .env file with valid values")
             return False
 
         return True
 
-    @classmethod
-    def get_config_summary(cls) -> dict:
+    def get_config_summary(self) -> dict:
         """Get a summary of current configuration for debugging."""
         return {
-            "api_configured": bool(
-                cls.GOOGLE_API_KEY
-                and cls.GOOGLE_API_KEY != "your_google_ai_api_key_here"
-            ),
-            "debug_mode": cls.DEBUG,
+            "api_configured": self.GOOGLE_API_KEY not in _UNSET_API_KEYS,
+            "debug_mode": self.DEBUG,
             "features_enabled": {
-                "document_library": cls.ENABLE_DOCUMENT_LIBRARY,
-                "qa_assistant": cls.ENABLE_QA_ASSISTANT,
-                "market_comparison": cls.ENABLE_MARKET_COMPARISON,
-                "timeline_tracker": cls.ENABLE_TIMELINE_TRACKER,
-                "export_features": cls.ENABLE_EXPORT_FEATURES,
+                "document_library": self.ENABLE_DOCUMENT_LIBRARY,
+                "qa_assistant": self.ENABLE_QA_ASSISTANT,
+                "market_comparison": self.ENABLE_MARKET_COMPARISON,
+                "timeline_tracker": self.ENABLE_TIMELINE_TRACKER,
+                "export_features": self.ENABLE_EXPORT_FEATURES,
             },
-            "supported_file_types": cls.SUPPORTED_FILE_TYPES,
-            "max_file_size_mb": cls.MAX_FILE_SIZE_MB,
-            "risk_sensitivity": cls.RISK_SENSITIVITY,
-            "region": cls.DEFAULT_REGION,
-            "currency": cls.DEFAULT_CURRENCY,
+            "supported_file_types": self.SUPPORTED_FILE_TYPES,
+            "max_file_size_mb": self.MAX_FILE_SIZE_MB,
+            "risk_sensitivity": self.RISK_SENSITIVITY,
+            "region": self.DEFAULT_REGION,
+            "currency": self.DEFAULT_CURRENCY,
         }
 
 
+def _flag(env: Mapping[str, str], name: str, default: str) -> bool:
+    """Read a "true"/"false" environment variable."""
+    return env.get(name, default).lower() == "true"
+
+
+@functools.cache
+def _dotenv() -> dict:
+    """Parse the project's .env file once per interpreter."""
+    values = dotenv_values(find_dotenv())
+    return {key: value for key, value in values.items() if value is not None}
+
+
+@functools.cache
+def get_config() -> Config:
+    """Read the configuration from the environment once and reuse it.
+
+    Values in the .env file fill in anything not set in the real environment.
+    """
+    env = {**_dotenv(), **os.environ}
+    return Config(
+        GOOGLE_API_KEY=env.get("GOOGLE_API_KEY", ""),
+        DEBUG=_flag(env, "DEBUG", "True"),
+        STREAMLIT_SERVER_PORT=int(env.get("STREAMLIT_SERVER_PORT", "8501")),
+        STREAMLIT_SERVER_ADDRESS=env.get("STREAMLIT_SERVER_ADDRESS", "localhost"),
+        MAX_FILE_SIZE_MB=int(env.get("MAX_FILE_SIZE_MB", "10")),
+        SUPPORTED_FILE_TYPES=env.get("SUPPORTED_FILE_TYPES", "pdf,docx,txt").split(","),
+        LOG_LEVEL=env.get("LOG_LEVEL", "INFO"),
+        LOG_FILE=env.get("LOG_FILE", "./data/app.log"),
+        SECRET_KEY=env.get("SECRET_KEY", "development-key-change-in-production"),
+        SESSION_TIMEOUT_MINUTES=int(env.get("SESSION_TIMEOUT_MINUTES", "60")),
+        CHAT_MODEL=env.get("CHAT_MODEL", "gemini-1.5-flash"),
+        TEMPERATURE=float(env.get("TEMPERATURE", "0.2")),
+        MAX_TOKENS=int(env.get("MAX_TOKENS", "2048")),
+        EMBEDDING_MODEL=env.get("EMBEDDING_MODEL", "models/embedding-001"),
+        CHROMA_PERSIST_DIR=env.get("CHROMA_PERSIST_DIRECTORY", "./data/chroma_db"),
+        UPLOAD_DIR=env.get("UPLOAD_DIR", "./uploads"),
+        DATA_DIR=env.get("DATA_DIR", "./data"),
+        DATABASE_URL=env.get("DATABASE_URL", "sqlite:///./data/lega.db"),
+        MAX_CONCURRENT_UPLOADS=int(env.get("MAX_CONCURRENT_UPLOADS", "5")),
+        DOCUMENT_PROCESSING_TIMEOUT=int(env.get("DOCUMENT_PROCESSING_TIMEOUT", "300")),
+        ENABLE_CACHE=_flag(env, "ENABLE_CACHE", "True"),
+        CACHE_TTL_SECONDS=int(env.get("CACHE_TTL_SECONDS", "3600")),
+        ENABLE_DOCUMENT_LIBRARY=_flag(env, "ENABLE_DOCUMENT_LIBRARY", "True"),
+        ENABLE_QA_ASSISTANT=_flag(env, "ENABLE_QA_ASSISTANT", "True"),
+        ENABLE_MARKET_COMPARISON=_flag(env, "ENABLE_MARKET_COMPARISON", "True"),
+        ENABLE_TIMELINE_TRACKER=_flag(env, "ENABLE_TIMELINE_TRACKER", "True"),
+        ENABLE_EXPORT_FEATURES=_flag(env, "ENABLE_EXPORT_FEATURES", "True"),
+        ENABLE_ANALYTICS=_flag(env, "ENABLE_ANALYTICS", "False"),
+        ANALYTICS_API_KEY=env.get("ANALYTICS_API_KEY", ""),
+        ENABLE_ERROR_TRACKING=_flag(env, "ENABLE_ERROR_TRACKING", "False"),
+        SENTRY_DSN=env.get("SENTRY_DSN", ""),
+        DEFAULT_REGION=env.get("DEFAULT_REGION", "India"),
+        DEFAULT_CURRENCY=env.get("DEFAULT_CURRENCY", "INR"),
+        TIMEZONE=env.get("TIMEZONE", "Asia/Kolkata"),
+        RISK_SENSITIVITY=int(env.get("RISK_SENSITIVITY", "3")),
+        SIMPLIFICATION_LEVEL=env.get("SIMPLIFICATION_LEVEL", "intermediate"),
+        MAX_RISK_FACTORS=int(env.get("MAX_RISK_FACTORS", "10")),
+        API_REQUESTS_PER_MINUTE=int(env.get("API_REQUESTS_PER_MINUTE", "60")),
+        API_REQUESTS_PER_DAY=int(env.get("API_REQUESTS_PER_DAY", "1000")),
+        ENABLE_AUTO_BACKUP=_flag(env, "ENABLE_AUTO_BACKUP", "False"),
+        BACKUP_INTERVAL_HOURS=int(env.get("BACKUP_INTERVAL_HOURS", "24")),
+        BACKUP_RETENTION_DAYS=int(env.get("BACKUP_RETENTION_DAYS", "30")),
+        AUTO_CLEANUP_TEMP_FILES=_flag(env, "AUTO_CLEANUP_TEMP_FILES", "True"),
+        CLEANUP_INTERVAL_HOURS=int(env.get("CLEANUP_INTERVAL_HOURS", "6")),
+    )
+
+
 # Create singleton instance
-config = Config()
+config = get_config()
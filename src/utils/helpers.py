@@ -1,19 +1,38 @@
 import hashlib
 import os
 import uuid
+from bisect import bisect_left
+from collections import deque
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import re
 
 
+# Random version-4 UUIDs drawn from one os.urandom call per batch
+_UUID_BATCH_SIZE = 256
+_uuid_pool: deque = deque()
+
+
+def _pooled_uuid4() -> uuid.UUID:
+    """Return a random UUID like uuid.uuid4(), refilling the pool as needed."""
+    try:
+        return _uuid_pool.popleft()
+    except IndexError:
+        raw = os.urandom(16 * _UUID_BATCH_SIZE)
+        _uuid_pool.extend(
+            uuid.UUID(bytes=raw[i : i + 16], version=4) for i in range(0, len(raw), 16)
+        )
+        return _uuid_pool.popleft()
+
+
 def generate_document_id() -> str:
     """Generate a unique document ID."""
-    return str(uuid.uuid4())
+    return str(_pooled_uuid4())
 
 
 def generate_session_id() -> str:
     """Generate a unique session ID."""
-    return str(uuid.uuid4())
+    return str(_pooled_uuid4())
 
 
 def calculate_file_hash(file_content: bytes) -> str:
@@ -21,10 +40,30 @@ def calculate_file_hash(file_content: bytes) -> str:
     return hashlib.sha256(file_content).hexdigest()
 
 
+# Anything that is not safe in a stored filename
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w\-_\.]")
+
+
+class _FilenameTable(dict):
+    """str.translate table replacing unsafe filename characters with "_".
+
+    Entries are filled in from _UNSAFE_FILENAME_CHARS the first time each
+    character is seen, so the table stays exact for Unicode word characters.
+    """
+
+    def __missing__(self, code: int):
+        value = "_" if _UNSAFE_FILENAME_CHARS.match(chr(code)) else code
+        self[code] = value
+        return value
+
+
+_FILENAME_TABLE = _FilenameTable()
+
+
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe storage."""
     # Remove or replace dangerous characters
-    sanitized = re.sub(r"[^\w\-_\.]", "_", filename)
+    sanitized = filename.translate(_FILENAME_TABLE)
     # Ensure it's not too long
     if len(sanitized) > 255:
         name, ext = os.path.splitext(sanitized)
@@ -32,124 +71,156 @@ def sanitize_filename(filename: str) -> str:
     return sanitized
 
 
+_SIZE_NAMES = ("B", "KB", "MB", "GB")
+
+
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format."""
     if size_bytes == 0:
         return "0 B"
 
-    size_names = ["B", "KB", "MB", "GB"]
-    i = 0
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
+    # Each unit is 2**10 times the last, so the bit length picks the unit
+    i = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_NAMES) - 1)
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_NAMES[i]}"
+
+
+# Extraction patterns, compiled once at import
+# All date formats in one alternation, so the text is scanned once and dates
+# come out in document order
+_DATE_PATTERN = re.compile(
+    "|".join(
+        [
+            r"\b\d{1,2}/\d{1,2}/\d{4}\b",  # MM/DD/YYYY
+            r"\b\d{1,2}-\d{1,2}-\d{4}\b",  # MM-DD-YYYY
+            r"\b\d{4}-\d{1,2}-\d{1,2}\b",  # YYYY-MM-DD
+            r"\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b",
+        ]
+    ),
+    re.IGNORECASE,
+)
+
+# All currency formats in one alternation, so amounts are found in one scan
+_MONEY_PATTERN = re.compile(
+    "|".join(
+        [
+            r"₹[\d,]+(?:\.\d{2})?",  # Indian Rupees
+            r"Rs\.?\s*[\d,]+(?:\.\d{2})?",  # Rs. format
+            r"\$[\d,]+(?:\.\d{2})?",  # USD
+        ]
+    )
+)
 
-    return f"{size_bytes:.1f} {size_names[i]}"
+_PERCENTAGE_PATTERN = re.compile(r"\d+(?:\.\d+)?%")
+
+_INTEREST_PATTERN = re.compile(
+    r"(?:interest rate|APR|annual percentage rate).*?(\d+(?:\.\d+)?%)", re.IGNORECASE
+)
 
 
 def extract_key_dates(text: str) -> List[Dict[str, Any]]:
     """Extract dates and deadlines from text."""
-    date_patterns = [
-        r"\b\d{1,2}/\d{1,2}/\d{4}\b",  # MM/DD/YYYY
-        r"\b\d{1,2}-\d{1,2}-\d{4}\b",  # MM-DD-YYYY
-        r"\b\d{4}-\d{1,2}-\d{1,2}\b",  # YYYY-MM-DD
-        r"\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b",
+    return [
+        {
+            "date": match.group(),
+            "position": match.start(),
+            "context": text[max(0, match.start() - 50) : match.end() + 50],
+        }
+        for match in _DATE_PATTERN.finditer(text)
     ]
 
-    dates = []
-    for pattern in date_patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
-            dates.append(
-                {
-                    "date": match.group(),
-                    "position": match.start(),
-                    "context": text[max(0, match.start() - 50) : match.end() + 50],
-                }
-            )
-
-    return dates
-
 
 def extract_financial_terms(text: str) -> Dict[str, Any]:
     """Extract financial information from text."""
     financial_info = {}
 
     # Extract monetary amounts (Indian Rupees and other currencies)
-    money_patterns = [
-        r"₹[\d,]+(?:\.\d{2})?",  # Indian Rupees
-        r"Rs\.?\s*[\d,]+(?:\.\d{2})?",  # Rs. format
-        r"\$[\d,]+(?:\.\d{2})?",  # USD
-    ]
-
-    amounts = []
-    for pattern in money_patterns:
-        amounts.extend(re.findall(pattern, text))
+    amounts = _MONEY_PATTERN.findall(text)
 
     if amounts:
         financial_info["amounts"] = amounts
 
     # Extract percentages
-    percentage_pattern = r"\d+(?:\.\d+)?%"
-    percentages = re.findall(percentage_pattern, text)
+    percentages = _PERCENTAGE_PATTERN.findall(text)
     if percentages:
         financial_info["percentages"] = percentages
 
     # Extract interest rates
-    interest_pattern = (
-        r"(?:interest rate|APR|annual percentage rate).*?(\d+(?:\.\d+)?%)"
-    )
-    interest_matches = re.findall(interest_pattern, text, re.IGNORECASE)
+    interest_matches = _INTEREST_PATTERN.findall(text)
     if interest_matches:
         financial_info["interest_rates"] = interest_matches
 
     return financial_info
 
 
-def calculate_risk_score(risk_factors: List[Dict[str, Any]]) -> int:
-    """Calculate overall risk score from individual risk factors."""
-    if not risk_factors:
-        return 0
+def extract_all(text: str) -> Dict[str, Any]:
+    """Extract key dates and financial terms from text in one call."""
+    return {
+        "key_dates": extract_key_dates(text),
+        "financial_terms": extract_financial_terms(text),
+    }
+
 
-    risk_weights = {"critical": 25, "high": 15, "medium": 8, "low": 3}
+# Severity weights, with the casings models usually return precomputed so
+# most lookups don't need lower()
+_RISK_WEIGHTS = {
+    casing(severity): weight
+    for severity, weight in {"critical": 25, "high": 15, "medium": 8, "low": 3}.items()
+    for casing in (str.lower, str.title, str.upper)
+}
 
-    total_score = 0
-    for factor in risk_factors:
-        severity = factor.get("severity", "low").lower()
-        total_score += risk_weights.get(severity, 0)
+
+def calculate_risk_score(risk_factors: List[Dict[str, Any]]) -> int:
+    """Calculate overall risk score from individual risk factors."""
+    total_score = sum(
+        _RISK_WEIGHTS.get(severity) or _RISK_WEIGHTS.get(severity.lower(), 0)
+        for severity in (factor.get("severity", "low") for factor in risk_factors)
+    )
 
     # Cap at 100
     return min(total_score, 100)
 
 
+# Risk score bands of 25 points, lowest first
+_RISK_COLORS = ("#44AA44", "#FFCC00", "#FF8800", "#FF4444")  # Green to red
+_RISK_LEVELS = ("Low", "Medium", "High", "Critical")
+
+
+def _risk_band(risk_score: int) -> int:
+    """Index of the 25-point band a risk score falls in, clamped to 0-3."""
+    return min(max(int(risk_score), 0), 99) // 25
+
+
 def get_risk_color(risk_score: int) -> str:
     """Get color code based on risk score."""
-    if risk_score >= 75:
-        return "#FF4444"  # Red
-    elif risk_score >= 50:
-        return "#FF8800"  # Orange
-    elif risk_score >= 25:
-        return "#FFCC00"  # Yellow
-    else:
-        return "#44AA44"  # Green
+    return _RISK_COLORS[_risk_band(risk_score)]
+
+
+def get_risk_level(risk_score: int) -> str:
+    """Get the risk level label for a risk score."""
+    return _RISK_LEVELS[_risk_band(risk_score)]
+
+
+_PERIOD = re.compile(r"\.")
 
 
 def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 100) -> List[str]:
     """Split text into overlapping chunks for processing."""
+    # Sentence ends are found in one pass and bisected per chunk, so only the
+    # final chunks are sliced out of the text
+    periods = [match.start() for match in _PERIOD.finditer(text)]
     chunks = []
     start = 0
 
     while start < len(text):
         end = start + chunk_size
-        chunk = text[start:end]
 
         # Try to break at sentence boundary
         if end < len(text):
-            last_period = chunk.rfind(".")
-            if last_period > chunk_size // 2:
-                chunk = chunk[: last_period + 1]
-                end = start + last_period + 1
+            i = bisect_left(periods, end) - 1
+            if i >= 0 and periods[i] - start > chunk_size // 2:
+                end = periods[i] + 1
 
-        chunks.append(chunk)
+        chunks.append(text[start:end])
         start = end - overlap
 
     return chunks
@@ -157,7 +228,8 @@ def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 100) -> List[st
 
 def format_timestamp(timestamp: datetime) -> str:
     """Format timestamp for display."""
-    now = datetime.now()
+    # Match the timestamp's awareness (model timestamps are UTC-aware)
+    now = datetime.now(timestamp.tzinfo)
     diff = now - timestamp
 
     if diff.days > 0:
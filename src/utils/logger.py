@@ -1,58 +1,100 @@
+import atexit
+import functools
 import logging
 import os
+import queue
+import threading
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from datetime import datetime
 from src.utils.config import config
 
 
+logger = logging.getLogger(__name__)
+
+# Log records buffered in memory before they are written to LOG_FILE
+LOG_BUFFER_CAPACITY = 100
+
+
+# Streamlit runs each session's script on its own thread, so the first calls
+# to setup_logging can race
+_setup_lock = threading.Lock()
+
+
 def setup_logging():
-    """Set up logging configuration."""
+    """Set up logging configuration (only the first call has any effect)."""
+    with _setup_lock:
+        return _configure_logging()
+
+
+@functools.cache
+def _configure_logging() -> logging.Logger:
     # Create data directory if it doesn't exist
     os.makedirs(os.path.dirname(config.LOG_FILE), exist_ok=True)
 
-    # Configure logging
-    logging.basicConfig(
-        level=getattr(logging, config.LOG_LEVEL),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.FileHandler(config.LOG_FILE), logging.StreamHandler()],
+    # Configure logging. Callers only put records on a queue; a listener
+    # thread formats them and does the file and console writes.
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
-
-    return logging.getLogger(__name__)
+    file_handler = logging.FileHandler(config.LOG_FILE)
+    console_handler = logging.StreamHandler()
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+
+    # File writes are batched: records are held until LOG_BUFFER_CAPACITY
+    # have built up or an error arrives, and flushed at shutdown
+    handlers = [
+        MemoryHandler(
+            LOG_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=file_handler,
+            flushOnClose=True,
+        ),
+        console_handler,
+    ]
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    # Stopping the listener drains the queue, so no records are lost at exit
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, config.LOG_LEVEL))
+    root.addHandler(QueueHandler(log_queue))
+
+    return logger
 
 
 def log_document_upload(filename: str, file_size: int) -> None:
     """Log document upload event."""
-    logger = logging.getLogger(__name__)
-    logger.info(f"Document uploaded: {filename} ({file_size} bytes)")
+    logger.info("Document uploaded: %s (%s bytes)", filename, file_size)
 
 
 def log_analysis_start(document_id: str) -> None:
     """Log analysis start event."""
-    logger = logging.getLogger(__name__)
-    logger.info(f"Starting analysis for document: {document_id}")
+    logger.info("Starting analysis for document: %s", document_id)
 
 
 def log_analysis_complete(document_id: str, processing_time: float) -> None:
     """Log analysis completion event."""
-    logger = logging.getLogger(__name__)
     logger.info(
-        f"Analysis completed for document: {document_id} in {processing_time:.2f}s"
+        "Analysis completed for document: %s in %.2fs", document_id, processing_time
     )
 
 
 def log_error(error_message: str, document_id: str = None) -> None:
     """Log error event."""
-    logger = logging.getLogger(__name__)
     if document_id:
-        logger.error(f"Error processing document {document_id}: {error_message}")
+        logger.error("Error processing document %s: %s", document_id, error_message)
     else:
-        logger.error(f"Application error: {error_message}")
+        logger.error("Application error: %s", error_message)
 
 
 def log_qa_interaction(document_id: str, question: str) -> None:
     """Log Q&A interaction."""
-    logger = logging.getLogger(__name__)
-    logger.info(f"Q&A interaction for document {document_id}: {question[:100]}...")
-
-
-# Initialize logging when module is imported
-setup_logging()
+    # Only build the truncated question when INFO records are emitted
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Q&A interaction for document %s: %s...", document_id, question[:100]
+        )
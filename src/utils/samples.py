@@ -0,0 +1,30 @@
+from pathlib import Path
+from typing import Tuple
+
+import streamlit as st
+
+
+# Bundled sample documents offered on the home, upload and library pages
+SAMPLE_DIR = Path("./sample")
+SAMPLE_SUFFIXES = {".pdf", ".docx", ".txt"}
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def list_sample_files(sample_dir: Path = SAMPLE_DIR) -> Tuple[Tuple[str, str], ...]:
+    """List (filename, display name) pairs for the sample documents.
+
+    The directory is rescanned at most once a minute.
+    """
+    # glob() yields nothing for a missing directory, so no exists() check
+    return tuple(
+        (path.name, _display_name(path))
+        for path in sorted(sample_dir.glob("*"))
+        if path.suffix.lower() in SAMPLE_SUFFIXES
+    )
+
+
+def _display_name(path: Path) -> str:
+    """Turn a sample filename into a label, keeping acronyms such as NDA."""
+    return " ".join(
+        word if word.isupper() else word.capitalize() for word in path.stem.split("_")
+    )